@@ -0,0 +1,192 @@
+import os
+import random
+import argparse
+from xml.sax.saxutils import escape, quoteattr
+
+# generates a synthetic Doxygen XML corpus, so that `make_docs.py` can be benchmarked without Doxygen
+
+words = ['alpha', 'beta', 'gamma', 'delta', 'value', 'index', 'buffer', 'node', 'tree', 'graph']
+
+def generate_text(rng, length):
+	return ' '.join(rng.choice(words) for i in range(length))
+
+def generate_description(rng, length, refs, rich=True):
+	parts = ['<para>', generate_text(rng, length), ' <computeroutput>x &lt; y</computeroutput> ']
+	if len(refs) > 0:
+		parts.append('<ref refid="{}" kindref="member">{}</ref> '.format(*rng.choice(refs)))
+	parts.append('<bold>b</bold> <emphasis>e</emphasis> <ulink url="http://example.com/a">link</ulink>')
+	if rng.random() < 0.2:
+		# links and anchors whose attributes must be escaped
+		parts.append(' <ulink url="http://example.com/a b/&#233;?q=&quot;1&quot;&amp;r=&lt;2&gt;">odd &#233; link</ulink> <anchor id="x&quot;y"/>')
+	if rich:
+		parts.append('<itemizedlist><listitem><para>item one</para></listitem><listitem><para>item two</para></listitem></itemizedlist>')
+		parts.append('<formula id="0">$x^2$</formula>')
+		parts.append('<parameterlist kind="templateparam"><parameteritem><parameternamelist><parametername>T</parametername></parameternamelist><parameterdescription><para>the type</para></parameterdescription></parameteritem></parameterlist>')
+		parts.append('<parameterlist kind="param"><parameteritem><parameternamelist><parametername>x</parametername></parameternamelist><parameterdescription><para>the x</para></parameterdescription></parameteritem></parameterlist>')
+		parts.append('<simplesect kind="return"><para>something</para></simplesect><simplesect kind="see"><para>other</para></simplesect>')
+	parts.append('</para>')
+	if rich:
+		parts.append('<para><programlisting><codeline><highlight class="keyword">int</highlight><sp/><highlight class="normal">x<sp/>=<sp/>1;</highlight></codeline></programlisting></para>')
+		parts.append('<para><table rows="2" cols="2"><row><entry thead="yes"><para>A</para></entry><entry thead="yes"><para>B</para></entry></row><row><entry thead="no"><para>1</para></entry><entry thead="no"><para>2</para></entry></row></table></para>')
+	return '<detaileddescription>' + ''.join(parts) + '</detaileddescription>'
+
+def generate_location(path, line, end):
+	return '<location file={0} line="{1}" column="1" bodyfile={0} bodystart="{1}" bodyend="{2}"/>'.format(quoteattr(path), line, end)
+
+def generate_template_params(count):
+	if count == 0:
+		return ''
+	params = ['<param><type>typename</type><declname>T{}</declname>{}</param>'.format(i, '<defval>int</defval>' if i == count - 1 else '') for i in range(count)]
+	return '<templateparamlist>' + ''.join(params) + '</templateparamlist>'
+
+def generate_function(rng, id, name, path, line, refs, template_count, length, static=False, const=False, documented=True):
+	out = ['<memberdef kind="function" id="{}" prot="public" static="{}" const="{}" explicit="no" inline="no" virt="non-virtual">'.format(id, 'yes' if static else 'no', 'yes' if const else 'no')]
+	out.append(generate_template_params(template_count))
+	if len(refs) > 0 and rng.random() < 0.5:
+		out.append('<type>const <ref refid="{}" kindref="compound">{}</ref> &amp;</type>'.format(*rng.choice(refs)))
+	else:
+		out.append('<type>int</type>')
+	out.append('<definition>int {0}</definition><argsstring>(int x)</argsstring><name>{0}</name>'.format(escape(name)))
+	out.append('<param><type>int</type><declname>x</declname></param>')
+	out.append('<param><type>const char *</type><declname>s</declname><defval>nullptr</defval></param>')
+	if rng.random() < 0.3:
+		out.append('<param><type>T(&amp;)</type><declname>arr</declname><array>[N]</array></param>')
+	out.append('<briefdescription></briefdescription>')
+	out.append(generate_description(rng, length, refs) if documented else '<detaileddescription></detaileddescription>')
+	out.append(generate_location(path, line, line + 3))
+	out.append('</memberdef>')
+	return ''.join(out)
+
+def generate_variable(rng, id, name, path, line, refs, length, kind='variable'):
+	out = ['<memberdef kind="{}" id="{}" prot="public" static="no">'.format(kind, id)]
+	if kind == 'variable':
+		out.append('<type>unsigned int</type>')
+	out.append('<name>{}</name>'.format(name))
+	out.append('<initializer>42</initializer>' if kind == 'define' else '<initializer>= 7</initializer>')
+	out.append('<briefdescription></briefdescription>')
+	out.append(generate_description(rng, length, refs, rich=False))
+	out.append(generate_location(path, line, line))
+	out.append('</memberdef>')
+	return ''.join(out)
+
+def generate_typedef(rng, id, name, path, line, refs, length, function_pointer=False):
+	out = ['<memberdef kind="typedef" id="{}" prot="public" static="no">'.format(id)]
+	if function_pointer:
+		out.append('<type>void()</type><argsstring>(int)</argsstring>')
+	else:
+		out.append('<type>unsigned long</type><argsstring></argsstring>')
+	out.append('<name>{}</name><briefdescription></briefdescription>'.format(name))
+	out.append(generate_description(rng, length, refs, rich=False))
+	out.append(generate_location(path, line, line))
+	out.append('</memberdef>')
+	return ''.join(out)
+
+def write_xml(xml_dir, id, contents):
+	with open(os.path.join(xml_dir, id + '.xml'), 'w') as f:
+		f.write('<?xml version="1.0"?><doxygen version="1.8.17">' + contents + '</doxygen>')
+
+def get_page_id(path):
+	# Doxygen encodes the path of each markdown page into its refid
+	encoded = []
+	for c in path:
+		if c == '/':
+			encoded.append('_2')
+		elif c == '_':
+			encoded.append('__')
+		elif c.isupper():
+			encoded.append('_' + c.lower())
+		else:
+			encoded.append(c)
+	return 'md_' + ''.join(encoded)
+
+def generate_corpus(xml_dir, src_root, repos=2, files=4, structs=3, members=5, template_params=2, description_length=20, seed=1):
+	# writes the XML files of the corpus into `xml_dir`, with source files located in `src_root`, and returns the number of compounds
+	rng = random.Random(seed)
+	os.makedirs(xml_dir, exist_ok=True)
+	index = ['<?xml version="1.0"?><doxygenindex version="1.8.17">']
+	refs = []
+	for r in range(repos):
+		for f in range(files):
+			for s in range(structs):
+				refs.append(('structrepo{}_f{}_s{}'.format(r, f, s), 'S{}_{}'.format(f, s)))
+
+	namespace_members = []
+	for r in range(repos):
+		repo = 'repo{}'.format(r)
+		for f in range(files):
+			directory = 'include' if f % 2 == 0 else os.path.join('src', 'detail')
+			path = os.path.join(src_root, repo, directory, 'file{}.h'.format(f))
+			file_id = '{}_f{}_8h'.format(repo, f)
+			file_members = []
+			line = 10
+			for m in range(members):
+				id = file_id + '_1a{}'.format(m)
+				kind = m % 5
+				if kind == 0:
+					file_members.append(generate_function(rng, id, 'fn{}'.format(m), path, line, refs, template_params, description_length, documented=(m != 5)))
+				elif kind == 1:
+					file_members.append(generate_variable(rng, id, 'var{}'.format(m), path, line, refs, description_length))
+				elif kind == 2:
+					file_members.append(generate_variable(rng, id, 'DEF{}'.format(m), path, line, refs, description_length, kind='define'))
+				elif kind == 3:
+					file_members.append(generate_typedef(rng, id, 'td{}'.format(m), path, line, refs, description_length, function_pointer=(m % 2 == 1)))
+				else:
+					file_members.append(generate_function(rng, id, 'operator==' if m % 2 == 1 else 'fn{}'.format(m), path, line, refs, 0, description_length, static=True))
+				line += 5
+
+			# a namespace member located in this file, and an undocumented member which should be hidden
+			namespace_members.append(generate_function(rng, file_id + '_ns', 'nsfn', path, line, refs, 1, description_length))
+			line += 5
+			file_members.append('<memberdef kind="function" id="{}_undoc" prot="public" static="no" const="no"><type>void</type><name>hidden</name><briefdescription/><detaileddescription></detaileddescription>{}</memberdef>'.format(file_id, generate_location(path, line, line + 1)))
+			write_xml(xml_dir, file_id, '<compounddef id="{}" kind="file" language="C++"><compoundname>file{}.h</compoundname><sectiondef kind="func">{}</sectiondef><briefdescription/>{}<location file={}/></compounddef>'.format(file_id, f, ''.join(file_members), generate_description(rng, description_length, refs), quoteattr(path)))
+			index.append('<compound refid="{}" kind="file"><name>file{}.h</name></compound>'.format(file_id, f))
+
+			line = 100
+			for s in range(structs):
+				struct_id = 'struct{}_f{}_s{}'.format(repo, f, s)
+				sections = {'public-attrib' : [], 'public-func' : [], 'public-static-func' : [], 'public-type' : []}
+				for m in range(members):
+					id = struct_id + '_1a{}'.format(m)
+					kind = m % 4
+					member_line = line + 1 + m
+					if kind == 0:
+						sections['public-attrib'].append(generate_variable(rng, id, 'field{}'.format(m), path, member_line, refs, description_length))
+					elif kind == 1:
+						sections['public-func'].append(generate_function(rng, id, 'method{}'.format(m), path, member_line, refs, template_params, description_length, const=True))
+					elif kind == 2:
+						sections['public-static-func'].append(generate_function(rng, id, 'smethod{}'.format(m), path, member_line, refs, 0, description_length, static=True))
+					else:
+						sections['public-type'].append(generate_typedef(rng, id, 'type{}'.format(m), path, member_line, refs, description_length))
+				sectiondefs = ''.join('<sectiondef kind="{}">{}</sectiondef>'.format(kind, ''.join(section)) for kind, section in sections.items() if len(section) > 0)
+				description = generate_description(rng, description_length, refs) if s != 1 else '<detaileddescription></detaileddescription>'
+				write_xml(xml_dir, struct_id, '<compounddef id="{}" kind="struct" language="C++" prot="public"><compoundname>ns::S{}_{}</compoundname>{}{}<briefdescription/>{}{}</compounddef>'.format(struct_id, f, s, generate_template_params(template_params), sectiondefs, description, generate_location(path, line, line + members + 1)))
+				index.append('<compound refid="{}" kind="struct"><name>ns::S{}_{}</name></compound>'.format(struct_id, f, s))
+				line += members + 3
+
+		# the README page of this repo
+		page_id = get_page_id(os.path.join(src_root, repo, 'README'))
+		description = generate_description(rng, description_length, refs)[len('<detaileddescription>'):-len('</detaileddescription>')]
+		write_xml(xml_dir, page_id, '<compounddef id="{0}" kind="page"><compoundname>{0}</compoundname><title>Readme</title><detaileddescription><para><heading level="2">Getting Started</heading></para>{1}</detaileddescription></compounddef>'.format(page_id, description))
+		index.append('<compound refid="{0}" kind="page"><name>{0}</name></compound>'.format(page_id))
+
+	write_xml(xml_dir, 'namespacens', '<compounddef id="namespacens" kind="namespace"><compoundname>ns</compoundname><sectiondef kind="func">{}</sectiondef><briefdescription/><detaileddescription/></compounddef>'.format(''.join(namespace_members)))
+	index.append('<compound refid="namespacens" kind="namespace"><name>ns</name></compound>')
+	index.append('</doxygenindex>')
+	with open(os.path.join(xml_dir, 'index.xml'), 'w') as f:
+		f.write(''.join(index))
+	return len(index) - 2
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Generates a synthetic Doxygen XML corpus for benchmarking make_docs.py.')
+	parser.add_argument('xml_dir', help='the directory in which to write the XML files (make_docs.py reads them from Docs/xml)')
+	parser.add_argument('--src-root', default=os.path.abspath('../') + os.path.sep, help='the directory containing the (fictional) source repositories, which should match the src_root of make_docs.py')
+	parser.add_argument('--repos', type=int, default=2, help='number of source repositories, each with its own README page')
+	parser.add_argument('--files', type=int, default=4, help='number of header files per repository')
+	parser.add_argument('--structs', type=int, default=3, help='number of structs per file')
+	parser.add_argument('--members', type=int, default=5, help='number of members per file and per struct')
+	parser.add_argument('--template-params', type=int, default=2, help='number of template parameters of each templated struct and function')
+	parser.add_argument('--description-length', type=int, default=20, help='number of words in each description paragraph')
+	parser.add_argument('--seed', type=int, default=1, help='the random seed')
+	args = parser.parse_args()
+	count = generate_corpus(args.xml_dir, os.path.join(args.src_root, ''), args.repos, args.files, args.structs, args.members, args.template_params, args.description_length, args.seed)
+	print('Generated {} compounds in {}.'.format(count, args.xml_dir))
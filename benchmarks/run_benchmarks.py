@@ -0,0 +1,124 @@
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import tempfile
+from shutil import copyfile, rmtree
+from generate_corpus import generate_corpus
+
+# runs `make_docs.py` end to end on synthetic corpora, and records its throughput and peak memory
+
+repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+input_files = ['make_docs.py', 'header.html', 'footer.html', 'style.css', 'script.js', 'hamburger.svg', 'critical.css']
+
+# the parameters of `generate_corpus` for each corpus: (repos, files, structs, members, template_params, description_length)
+corpora = {
+	'small' : (2, 4, 3, 5, 2, 20),
+	'medium' : (3, 20, 5, 20, 2, 30),
+	'large' : (3, 60, 5, 20, 2, 30),
+	'wide' : (4, 100, 2, 5, 0, 10),
+	'deep' : (1, 10, 10, 80, 4, 60),
+	'anchors' : (1, 1, 100, 49, 0, 10)	# a single page with about 5,000 anchors, for profiling the scrolling of script.js in a browser
+}
+
+def get_size(directory, extension):
+	# returns the number and total size in bytes of the files in `directory` with the given extension
+	count, size = 0, 0
+	for dirpath, dirnames, filenames in os.walk(directory):
+		for filename in filenames:
+			if filename.endswith(extension):
+				count += 1
+				size += os.path.getsize(os.path.join(dirpath, filename))
+	return count, size
+
+def get_revision():
+	try:
+		return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=repo_dir, capture_output=True, text=True, check=True).stdout.strip()
+	except (OSError, subprocess.CalledProcessError):
+		return None
+
+def run_make_docs(work_dir, args):
+	# returns the wall time in seconds and the peak resident memory in bytes of a single build
+	start = time.perf_counter()
+	process = subprocess.Popen([sys.executable, 'make_docs.py'] + args, cwd=work_dir, stdout=subprocess.DEVNULL)
+	pid, status, usage = os.wait4(process.pid, 0)
+	elapsed = time.perf_counter() - start
+	process.returncode = os.waitstatus_to_exitcode(status)
+	if process.returncode != 0:
+		raise RuntimeError('make_docs.py {} exited with status {}.'.format(' '.join(args), process.returncode))
+	# `ru_maxrss` is in kilobytes on Linux
+	return elapsed, usage.ru_maxrss * 1024
+
+def run_benchmark(name, root, args, repeat):
+	# the source repositories are siblings of the 'archivist' directory, since `make_docs.py` uses the parent directory as `src_root`
+	corpus_dir = os.path.join(root, name)
+	work_dir = os.path.join(corpus_dir, 'archivist')
+	xml_dir = os.path.join(work_dir, 'Docs', 'xml')
+	if not os.path.isdir(xml_dir):
+		generate_corpus(xml_dir, corpus_dir + os.path.sep, *corpora[name])
+	for filename in input_files:
+		copyfile(os.path.join(repo_dir, filename), os.path.join(work_dir, filename))
+
+	times, peaks = [], []
+	for i in range(repeat):
+		elapsed, peak = run_make_docs(work_dir, args)
+		times.append(elapsed)
+		peaks.append(peak)
+	xml_count, xml_size = get_size(xml_dir, '.xml')
+	page_count, page_size = get_size(os.path.join(work_dir, 'Docs', 'html'), '.html')
+	best = min(times)
+	return {
+		'corpus' : name,
+		'xml_files' : xml_count,
+		'xml_bytes' : xml_size,
+		'pages' : page_count,
+		'html_bytes' : page_size,
+		'seconds' : best,
+		'pages_per_second' : page_count / best,
+		'mb_per_second' : xml_size / 2**20 / best,
+		'peak_memory' : max(peaks)
+	}
+
+def print_results(results, baseline):
+	print('{:<8}{:>8}{:>10}{:>10}{:>11}{:>10}{:>12}'.format('corpus', 'pages', 'XML MB', 'time (s)', 'pages/s', 'MB/s', 'peak MB'))
+	for result in results:
+		print('{:<8}{:>8}{:>10.1f}{:>10.2f}{:>11.1f}{:>10.2f}{:>12.1f}'.format(result['corpus'], result['pages'], result['xml_bytes'] / 2**20,
+			result['seconds'], result['pages_per_second'], result['mb_per_second'], result['peak_memory'] / 2**20), end='')
+		if result['corpus'] in baseline:
+			previous = baseline[result['corpus']]
+			print('   ({:+.1%} time, {:+.1%} memory)'.format(result['seconds'] / previous['seconds'] - 1, result['peak_memory'] / previous['peak_memory'] - 1))
+		else:
+			print()
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Benchmarks make_docs.py on synthetic Doxygen XML corpora. Any arguments after "--" are passed to make_docs.py.')
+	parser.add_argument('corpora', nargs='*', default=['small', 'medium'], help='the corpora to benchmark: {} (default: small medium)'.format(', '.join(corpora)))
+	parser.add_argument('-r', '--repeat', type=int, default=3, help='number of builds per corpus; the fastest is reported')
+	parser.add_argument('-o', '--output', metavar='FILE', help='write the results as JSON to FILE')
+	parser.add_argument('-b', '--baseline', metavar='FILE', help='compare against the results previously written with --output to FILE')
+	parser.add_argument('--work-dir', help='the directory in which the corpora are generated and built; it is reused across runs (by default, a temporary directory is used)')
+	args, make_docs_args = parser.parse_known_args()
+	if len(make_docs_args) > 0 and make_docs_args[0] == '--':
+		make_docs_args = make_docs_args[1:]
+	for name in args.corpora:
+		if name not in corpora:
+			parser.error('Unrecognized corpus "{}".'.format(name))
+
+	baseline = {}
+	if args.baseline != None:
+		with open(args.baseline, 'r') as f:
+			baseline = {result['corpus'] : result for result in json.load(f)['results']}
+
+	root = args.work_dir if args.work_dir != None else tempfile.mkdtemp(prefix='make_docs_bench')
+	try:
+		results = [run_benchmark(name, os.path.abspath(root), make_docs_args, args.repeat) for name in args.corpora]
+	finally:
+		if args.work_dir == None:
+			rmtree(root, True)
+	print_results(results, baseline)
+
+	if args.output != None:
+		with open(args.output, 'w') as f:
+			json.dump({'revision' : get_revision(), 'arguments' : make_docs_args, 'results' : results}, f, indent=1)
@@ -91,6 +91,13 @@ function build_assets() {
 		.pipe(dest(paths.siteAssetFiles));
 }
 
+// Copies the files fetched by script.js as they are, keeping their directories
+// (they only exist with the corresponding options of make_docs.py).
+function build_data() {
+	return src(paths.dataFilesGlob, { base : paths.srcAssetFolderName, allowEmpty : true })
+		.pipe(dest(paths.siteAssetFiles));
+}
+
 function clean_assets(callback) {
 	return del([paths.siteAssetFiles])
 		.then(function(result) {callback();});
@@ -113,7 +120,7 @@ function clean_fonts(callback) {
 }
 
 function html() {
-	return src(paths.srcHtmlFolderName + '/**/*.html')
+	return src([paths.srcHtmlFolderName + '/**/*.html', '!' + paths.srcHtmlFolderName + '/nav.html'])
 		.pipe(inliner({ rootpath : paths.srcHtmlFolderName }))
 		.pipe(htmlmin({collapseWhitespace: true}))
 		.pipe(dest(paths.siteDir));
@@ -129,6 +136,13 @@ function build_docs_html() {
 		.on('error', log.error);
 }
 
+// Runs Doxygen on each repository concurrently, and builds the documentation
+// of each repository as soon as its XML output is ready.
+function build_docs_parallel() {
+	return run('python make_docs.py --doxygen Doxyfile --jobs 0').exec()
+		.on('error', log.error);
+}
+
 // Deletes the entire _site directory.
 function clean_docs(callback) {
 	return del([paths.srcXmlFolderName, paths.srcHtmlFolderName, paths.siteDir])
@@ -145,12 +159,17 @@ const clean = parallel(
 
 // Builds site anew.
 const build = series(clean, build_docs_xml, build_docs_html,
-		parallel(build_scripts, build_images, build_assets, build_styles, build_fonts),
+		parallel(build_scripts, build_images, build_assets, build_data, build_styles, build_fonts),
 		html);
 
 // Default Task: builds site.
 export default build;
 
+// Builds site anew, running Doxygen on each repository in parallel.
+export const build_parallel = series(clean, build_docs_parallel,
+		parallel(build_scripts, build_images, build_assets, build_data, build_styles, build_fonts),
+		html);
+
 // Updates Ruby gems
 function update_bundle() {
 	return src('')
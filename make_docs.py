@@ -1,23 +1,146 @@
 import os
+import re
+import copy
+import argparse
 import hashlib
+import json
+import sqlite3
+import pickle
+import copyreg
+import gzip
+import multiprocessing
+import contextlib
+import cProfile
+import time
+import tracemalloc
+import threading
+import subprocess
+import shlex
+import http.server
 import html
-import urllib.parse
-from shutil import copyfile, rmtree
-import xml.etree.ElementTree as et
+from shutil import rmtree
+from fnmatch import fnmatchcase
+import xml.etree.ElementTree as std_et
 from io import StringIO
+try:
+	import lxml.etree
+except ImportError:
+	lxml = None
+try:
+	import brotli
+except ImportError:
+	brotli = None
 
 header_file = 'header.html'
 footer_file = 'footer.html'
 style_file = 'style.css'
 script_file = 'script.js'
 hamburger_file = 'hamburger.svg'
+critical_file = 'critical.css'
 src_root = os.path.abspath('../') + os.path.sep
 url_root = 'https://asaparov.org/docs/'
 source_file_url = 'https://github.com/asaparov/{0}/blob/master/{1}'
 source_line_url = 'https://github.com/asaparov/{0}/blob/master/{1}#L{2}'
 source_block_url = 'https://github.com/asaparov/{0}/blob/master/{1}#L{2}-L{3}'
+xml_dir = 'Docs/xml'	# the directory containing the Doxygen XML output
+html_dir = 'Docs/html'	# the directory into which the HTML pages are written
+manifest_file = 'Docs/manifest.json'	# records the inputs of every generated page, for incremental builds
+xml_backend = 'auto'	# the library used to parse the XML and serialize the HTML: 'lxml', 'etree' (the standard library), or 'auto' (lxml if it is installed)
+low_memory = False	# if True, the Doxygen XML subtrees needed for rendering are kept serialized until they are rendered
+lazy_load = False	# if True, the Doxygen XML subtrees needed for rendering are dropped after parsing, and reloaded from the XML files when their page is rendered
+shared_nav = False	# if True, the left navigation tree is written once to 'nav.html' and loaded by the script, rather than included in every page
+search_index = True	# if True, a search index of all documented symbols is written to 'search/', and each page gets a search box
+max_page_symbols = None	# if set, each documented struct in a file with more documented symbols than this gets its own page
+max_table_rows = None	# if set, the member tables with more rows than this are split into pages of this many rows
+template_dir = None	# if set, the markup templates in this directory override the defaults (see `default_markup`)
+hashed_assets = False	# if True, the stylesheet, script, and images are written with the hash of their contents in their filenames (e.g. 'style.<md5>.css'), which are listed in 'assets.json'
+relative_urls = False	# if True, the links to the pages and assets are relative, so that the site can be served from any location
+minify = False	# if True, the whitespace in the pages and stylesheets is collapsed, and the stylesheets marked `inline` in the templates are inlined
+shard = None	# if set, only the pages of this repository (the first component of the paths) are built, see `DocBuilder.export_registry`
+registry_dir = 'Docs/registry'	# the directory containing the registry of each shard, which lists its cross-reference targets, pages and symbols
+shards = None	# if set, the repositories of the project, so that the registries of the repositories that were removed from it are ignored
+cache_dir = None	# if set, the parsed compounds are cached in this directory, so that unchanged XML files aren't re-parsed in later builds
+doxygen_dir = 'Docs/doxygen'	# the directory into which `build_repositories` writes the Doxygen XML output and tag file of each repository
+cache_size = 1024	# the maximum size of the compound cache, in megabytes (the least recently used entries are evicted first)
+symbols_file = None	# if set, the parsed symbols are exported to this file, as an SQLite database (if its extension is '.db', '.sqlite' or '.sqlite3') or as line-delimited JSON
+formula_renderer = None	# if set, the formulas are prerendered at build time by this command or function (see `prerender_formulas` and `get_formula_renderer_id`), so that MathJax is only loaded by the pages with formulas that it couldn't render
+formula_cache_dir = 'Docs/formulas'	# the directory in which the prerendered formulas are cached
+compress = ()	# the formats ('gz' and/or 'br') in which every output file is also written, for servers that can send precompressed files
 refs = {}	# this map stores all refid's
+registry_refs = {}	# the URL of each refid in the other shards, when building a single shard
+struct_pages = {}	# the file and struct of the page of each struct that was split from its file (see `split_file`)
+compound_hashes = {}	# the hash of the XML file of each compound
+files = {}	# the `File` of each source file (see `DocBuilder.parse`)
+root = None	# the root `Path` of the navigation tree (see `DocBuilder.render`)
+markup = {}	# the compiled templates of the pages (see `read_markup`)
+formulas = {}	# the prerendered HTML of each formula (see `prerender_formulas`)
+nav_hash = None	# the hash of the navigation tree, which is part of the URL of 'nav.html' (see `shared_nav`)
+et = std_et	# the module of the active XML backend (see `set_xml_backend`)
+
+# the settings above that can be overridden for each project (see `DocBuilder`)
+settings = ('header_file', 'footer_file', 'style_file', 'script_file', 'hamburger_file', 'critical_file',
+	'src_root', 'url_root', 'source_file_url', 'source_line_url', 'source_block_url',
+	'xml_dir', 'html_dir', 'manifest_file', 'xml_backend', 'low_memory', 'lazy_load', 'shared_nav', 'search_index', 'max_page_symbols', 'max_table_rows', 'template_dir', 'hashed_assets', 'relative_urls', 'minify', 'shard', 'registry_dir', 'shards', 'doxygen_dir', 'cache_dir', 'cache_size', 'symbols_file', 'formula_renderer', 'formula_cache_dir', 'compress')
+
+
+def set_xml_backend(name):
+	global et
+	if name == 'auto':
+		name = 'etree' if lxml == None else 'lxml'
+	if name == 'lxml':
+		if lxml == None:
+			raise ValueError('The lxml backend was requested, but lxml is not installed.')
+		et = lxml.etree
+	elif name == 'etree':
+		et = std_et
+	else:
+		raise ValueError('Unrecognized XML backend "{}".'.format(name))
 
+class Profiler:
+	# records the wall time and peak memory of each phase of the build, and the time spent on each compound and page
+	def __init__(self):
+		self.enabled = False
+		self.phases = []	# list of (name, seconds, peak bytes)
+		self.compound_times = {}
+		self.page_times = {}
+
+	def start(self):
+		self.enabled = True
+		tracemalloc.start()
+
+	@contextlib.contextmanager
+	def phase(self, name):
+		if not self.enabled:
+			yield
+			return
+		tracemalloc.reset_peak()
+		start = time.perf_counter()
+		yield
+		self.phases.append((name, time.perf_counter() - start, tracemalloc.get_traced_memory()[1]))
+
+	@contextlib.contextmanager
+	def compound(self, ref):
+		if not self.enabled:
+			yield
+			return
+		start = time.perf_counter()
+		yield
+		self.compound_times[ref] = time.perf_counter() - start
+
+	def report(self, count=10):
+		print('{:<20}{:>12}{:>14}'.format('Phase', 'Wall time', 'Peak memory'))
+		for name, seconds, peak in self.phases:
+			print('{:<20}{:>10.3f} s{:>11.1f} MB'.format(name, seconds, peak / 2**20))
+		# indented phases are breakdowns of the phase above them
+		print('{:<20}{:>10.3f} s'.format('total', sum(seconds for name, seconds, peak in self.phases if not name.startswith(' '))))
+		print('\nSlowest pages (render + write):')
+		for key, seconds in sorted(self.page_times.items(), key=lambda item : item[1], reverse=True)[:count]:
+			print('{:>10.3f} s  {}'.format(seconds, key))
+		print('\nSlowest compounds (parse):')
+		for ref, seconds in sorted(self.compound_times.items(), key=lambda item : item[1], reverse=True)[:count]:
+			print('{:>10.3f} s  {}'.format(seconds, ref))
+
+profiler = Profiler()
 
 def md5_hash(path):
 	hasher = hashlib.md5()
@@ -26,12 +149,27 @@ def md5_hash(path):
 			hasher.update(block)
 	return hasher.hexdigest()
 
+generator_hash = md5_hash(__file__)	# identifies the version of this generator (make_docs.py, not script.js), so that its outputs are invalidated when it changes
+
+def md5_string(string):
+	return hashlib.md5(string.encode('utf-8')).hexdigest()
+
+def get_file_stamp(path):
+	# returns the modification time and size of the given file, or None if it doesn't exist
+	try:
+		stat = os.stat(path)
+	except OSError:
+		return None
+	return stat.st_mtime_ns, stat.st_size
+
 def get_path(path):
 	if path.find(src_root) != 0:
 		raise ValueError('Given filepath "{}" does not begin with source prefix.'.format(path))
 	return path[len(src_root):]
 
 class Location:
+	__slots__ = ('path', 'start', 'end')
+
 	def __init__(self, path, start, end):
 		self.path = get_path(path)
 		self.start = start
@@ -47,30 +185,44 @@ def get_source_link(location):
 	else:
 		return source_block_url.format(sundered[0], '/'.join(sundered[1:]), location.start, location.end)
 
+# the fields set by `index_objects`: whether the object is documented, the anchor of the object in its page, its
+# signature in plain text, the URL of its anchor, the URL of its source code, and the path of its page (without '.html')
+indexed_fields = ('visible', 'link', 'signature', 'url', 'source_link', 'page')
+
 class Variable:
+	__slots__ = ('type', 'name', 'description', 'initializer', 'location') + indexed_fields
+
 	def __init__(self, type, name, description, initializer, location):
 		self.type = type
 		self.name = name
 		self.description = description
 		self.initializer = initializer
 		self.location = location
-		self.link = None
+		self.visible = False
+		self.link = self.signature = self.url = self.source_link = self.page = None
 
 class Typedef:
+	__slots__ = ('type', 'name', 'args', 'description', 'location') + indexed_fields
+
 	def __init__(self, type, name, args, description, location):
 		self.type = type
 		self.name = name
 		self.args = args
 		self.description = description
 		self.location = location
-		self.link = None
+		self.visible = False
+		self.link = self.signature = self.url = self.source_link = self.page = None
 
 class TemplateParam:
+	__slots__ = ('type', 'default_value')
+
 	def __init__(self, type, default_value):
 		self.type = type
 		self.default_value = default_value
 
 class FunctionParam:
+	__slots__ = ('type', 'name', 'name_text', 'default_value')
+
 	def __init__(self, type, name, name_text, default_value):
 		self.type = type
 		self.name = name
@@ -93,11 +245,15 @@ class FunctionParam:
 		return htmlescape(self.to_text())
 
 class ParamDescription:
+	__slots__ = ('name', 'description')
+
 	def __init__(self, name, description):
 		self.name = name
 		self.description = description
 
 class Function:
+	__slots__ = ('type', 'name', 'name_text', 'is_static', 'is_const', 'templates', 'args', 'description', 'template_descriptions', 'arg_descriptions', 'location') + indexed_fields
+
 	def __init__(self, type, name, name_text, is_static, is_const, templates, args, description, template_descriptions, arg_descriptions, location):
 		self.type = type
 		if name.find('operator') == 0:
@@ -112,9 +268,12 @@ class Function:
 		self.template_descriptions = template_descriptions
 		self.arg_descriptions = arg_descriptions
 		self.location = location
-		self.link = None
+		self.visible = False
+		self.link = self.signature = self.url = self.source_link = self.page = None
 
 class Class:
+	__slots__ = ('name', 'name_text', 'namespace', 'templates', 'description', 'template_descriptions', 'objects', 'location') + indexed_fields
+
 	def __init__(self, name, name_text, namespace, templates, description, template_descriptions, objects, location):
 		self.name = name
 		self.name_text = name_text
@@ -124,13 +283,80 @@ class Class:
 		self.template_descriptions = template_descriptions
 		self.objects = objects
 		self.location = location
-		self.link = None
+		self.visible = False
+		self.link = self.signature = self.url = self.source_link = self.page = None
 
 class File:
+	__slots__ = ('description', 'objects', 'link', 'compounds', 'visible')
+
 	def __init__(self):
 		self.description = None
 		self.objects = []
 		self.link = None
+		self.compounds = []	# the refid's of the compound XML files that contribute to this file
+		self.visible = False	# whether any of the objects in this file are documented
+
+class PackedElement:
+	# a serialized Doxygen XML subtree, which is much smaller than the corresponding tree of `Element` objects
+	__slots__ = ('data', 'length')
+
+	def __init__(self, element):
+		self.data = serialize_element(element)
+		self.length = len(element)
+
+	def __len__(self):
+		return self.length
+
+	def unpack(self):
+		return et.fromstring(self.data)
+
+def serialize_element(element):
+	# serializes the subtree without its tail (as lxml's `with_tail=False`, which ElementTree doesn't support)
+	if et is not std_et:
+		return et.tostring(element, encoding='unicode', with_tail=False).encode('utf-8')
+	tail, element.tail = element.tail, None
+	data = et.tostring(element, encoding='unicode').encode('utf-8')	# much faster than ElementTree's 'utf-8' writer
+	element.tail = tail
+	return data
+
+def pack(element):
+	if not low_memory or element == None:
+		return element
+	packed = PackedElement(element)
+	if b'\r' in packed.data:
+		# ElementTree does not escape carriage returns in text, so they would not survive the round trip
+		return element
+	return packed
+
+class LazyElement:
+	# a Doxygen XML subtree that was dropped after parsing (see `lazy_load`), of which only the length, the text (for
+	# the small subtrees used in signatures), and the cross-references are kept; it is reloaded when it is rendered
+	__slots__ = ('kind', 'ref', 'index', 'length', 'text', 'refids', 'formulas')
+
+	def __init__(self, kind, ref, index, element, keep_text):
+		self.kind = kind
+		self.ref = ref
+		self.index = index	# the position of the subtree in `iter_subtrees` of its compound
+		self.length = len(element)
+		self.text = get_text(unpack(element)) if keep_text else None
+		self.refids = tuple(get_refids(element))
+		self.formulas = tuple(get_formulas(element))
+
+	def __len__(self):
+		return self.length
+
+	def load(self):
+		# the subtrees of the compound stay loaded until the current page is rendered
+		if self.ref not in loaded_subtrees:
+			loaded_subtrees[self.ref] = read_subtrees(self.kind, self.ref)
+		return loaded_subtrees[self.ref][self.index]
+
+loaded_subtrees = {}	# the subtrees of each compound that has been reloaded for the current page (see `LazyElement`)
+
+def unpack(element):
+	if isinstance(element, LazyElement):
+		element = element.load()
+	return element.unpack() if isinstance(element, PackedElement) else element
 
 def parse_variable(member):
 	type = member.find('type')
@@ -143,7 +369,7 @@ def parse_variable(member):
 		location = Location(location_attrib['bodyfile'], int(location_attrib['bodystart']), None)
 	else:
 		location = Location(location_attrib['file'], int(location_attrib['line']), None)
-	variable = Variable(type, name, description, initializer, location)
+	variable = Variable(pack(type), name, pack(description), initializer, location)
 	if 'id' in member.attrib:
 		refs[member.attrib['id']] = variable
 	return variable
@@ -155,7 +381,7 @@ def parse_typedef(member):
 	description = member.find('detaileddescription')
 	location_attrib = member.find('location').attrib
 	location = Location(location_attrib['bodyfile'], int(location_attrib['bodystart']), None)
-	typedef = Typedef(type, name, args, description, location)
+	typedef = Typedef(pack(type), name, pack(args), pack(description), location)
 	if 'id' in member.attrib:
 		refs[member.attrib['id']] = typedef
 	return typedef
@@ -185,13 +411,54 @@ def iterparent(tree):
 		for child in parent:
 			yield parent, child
 
+def get_ref_link(ref):
+	if ref not in refs:
+		return registry_refs.get(ref)
+	obj = refs[ref]
+	if isinstance(obj, File):
+		return obj.link
+	return obj.url
+
+class RenderCache:
+	# memoizes the HTML and text of each Doxygen XML subtree, keyed by the identity of the subtree
+	def __init__(self):
+		self.html = {}
+		self.text = {}
+		self.hits = 0
+		self.misses = 0
+
+	def get(self, cache, element):
+		# the entries keep a reference to their subtree, so that its id is not reused while it is in the cache
+		entry = cache.get(id(element))
+		if entry != None and entry[0] is element:
+			self.hits += 1
+			return entry[1]
+		self.misses += 1
+		return None
+
+	def clear(self):
+		self.html.clear()
+		self.text.clear()
+
+render_cache = RenderCache()
+
 def to_html(element):
+	str = render_cache.get(render_cache.html, element)
+	if str == None:
+		# the conversion modifies the tree, so convert a copy and leave the original intact
+		loaded = element.load() if isinstance(element, LazyElement) else element
+		str = convert_to_html(loaded.unpack() if isinstance(loaded, PackedElement) else copy.deepcopy(loaded))
+		render_cache.html[id(element)] = (element, str)
+	return str
+
+def convert_to_html(element):
 	# convert all XML tags into HTML tags, without changing the tree structure
-	parameter_lists, codelines, headings, tables, to_remove, simplesects, parents = [], [], [], [], set(), {}, {}
+	parameter_lists, codelines, headings, tables, to_remove, simplesects, parents, prerendered = [], [], [], [], set(), {}, {}, []
 	for parent, child in iterparent(element):
 		parents[child] = parent
 		if child.tag == 'para':
-			if child.find('.//para'):
+			nested = child.find('.//para')
+			if nested != None and len(nested) > 0:
 				to_remove.add(child)
 			child.tag = 'p'
 		elif child.tag == 'emphasis':
@@ -210,17 +477,11 @@ def to_html(element):
 			if not link.startswith('#') and not link.startswith(url_root):
 				child.attrib['target'] = '_blank'
 		elif child.tag == 'ref':
-			ref = child.attrib['refid']
-			if ref in refs:
-				obj = refs[ref]
-				if isinstance(obj, File):
-					child.tag = 'a'
-					child.attrib.clear()
-					child.attrib['href'] = obj.link
-				elif obj.link != None:
-					child.tag = 'a'
-					child.attrib.clear()
-					child.attrib['href'] = url_root + obj.location.path + '.html#' + obj.link
+			link = get_ref_link(child.attrib['refid'])
+			if link != None:
+				child.tag = 'a'
+				child.attrib.clear()
+				child.attrib['href'] = link
 		elif child.tag == 'parameterlist':
 			child.tag = 'table'
 			child.attrib['class'] = 'params'
@@ -228,7 +489,7 @@ def to_html(element):
 		elif child.tag == 'parameteritem':
 			child.tag = 'tr'
 		elif child.tag == 'parameternamelist':
-			text = to_htmltext(child)
+			text = htmlescape(get_text(child))
 			child.clear()
 			child.tag = 'td'
 			child.attrib['class'] = 'paraminfoname'
@@ -265,6 +526,11 @@ def to_html(element):
 				child.tag = 'span'
 			child.attrib.clear()
 			child.attrib['class'] = 'formula'
+			if child.text in formulas:
+				# the placeholder is replaced by the prerendered formula once the tree is serialized
+				child.attrib['class'] = 'formula prerendered'
+				prerendered.append(formulas[child.text])
+				child.text = '\ue000{}\ue000'.format(len(prerendered) - 1)
 		elif child.tag == 'table':
 			tables.append(child)
 		elif child.tag == 'row':
@@ -363,9 +629,39 @@ def to_html(element):
 		sp_to_spaces(codeline)
 
 	str = htmlescape(element.text) if element.text != None else ''
-	str += ''.join([et.tostring(child, encoding='utf-8', method='html').decode('utf-8') for child in element])
+	str += ''.join([tostring_html(child) for child in element])
+	if len(prerendered) > 0:
+		str = formula_placeholder.sub(lambda match : prerendered[int(match.group(1))], str)
 	return str.strip()
 
+formula_placeholder = re.compile('\ue000([0-9]+)\ue000')
+
+# lxml serializes attribute values differently from ElementTree when they contain these characters
+# (e.g. it percent-encodes URLs, and quotes values containing '"' with "'")
+lxml_uri_attributes = {'href', 'src', 'action', 'name'}
+lxml_unsafe_uri = re.compile('[^!#-;=-~]')
+lxml_unsafe_attribute = re.compile('["<\r]')
+
+def has_lxml_unsafe_attributes(element):
+	for node in element.iter():
+		for name, value in node.items():
+			if (lxml_unsafe_uri if name in lxml_uri_attributes else lxml_unsafe_attribute).search(value):
+				return True
+	return False
+
+def tostring_html(element):
+	if et is std_et:
+		# (serializing to a string is much faster than ElementTree's 'utf-8' writer)
+		return et.tostring(element, encoding='unicode', method='html')
+
+	# make sure the output is identical to that of ElementTree, by using its serializer for the rare elements where lxml differs
+	if not has_lxml_unsafe_attributes(element):
+		str = et.tostring(element, encoding='unicode', method='html')
+		if '&#13;' not in str:
+			return str
+	str = std_et.tostring(std_et.fromstring(et.tostring(element, encoding='utf-8', with_tail=False)), encoding='utf-8', method='html').decode('utf-8')
+	return str + (htmlescape(element.tail) if element.tail != None else '')
+
 def urlescape(str):
 	return str.replace(' ', '%20').replace('<','%3C').replace('>','%3E')
 
@@ -373,6 +669,15 @@ def htmlescape(str):
 	return html.escape(str, quote=False)
 
 def to_text(element):
+	if isinstance(element, LazyElement) and element.text != None:
+		return element.text
+	str = render_cache.get(render_cache.text, element)
+	if str == None:
+		str = get_text(unpack(element))
+		render_cache.text[id(element)] = (element, str)
+	return str
+
+def get_text(element):
 	str = ''
 	for child in element.itertext():
 		str += child
@@ -437,12 +742,12 @@ def parse_function(member):
 			name_text += array
 		default_value_element = arg.find('defval')
 		default_value = default_value_element.text if default_value_element != None else None
-		args.append(FunctionParam(type, name, name_text, default_value))
+		args.append(FunctionParam(pack(type), name, name_text, default_value))
 	for arg_description in member.findall('detaileddescription/parameterlist[@kind=\'param\']/parameteritem'):
 		name = template_description.find('parameternamelist/parametername').text
 		description = template_description.find('parameterdescription').text
 		arg_descriptions.append(ParamDescription(name, description))
-	function = Function(return_type, function_name, function_name_text, is_static, is_const, templates, args, function_description, template_descriptions, arg_descriptions, location)
+	function = Function(pack(return_type), function_name, function_name_text, is_static, is_const, templates, args, pack(function_description), template_descriptions, arg_descriptions, location)
 	if 'id' in member.attrib:
 		refs[member.attrib['id']] = function
 	return function
@@ -455,118 +760,384 @@ def parse_compound_name(compound_name):
 	namespace = '::'.join(tokens[:-1])
 	return htmlescape(name), name, namespace
 
+def get_xml_path(ref):
+	return os.path.join(xml_dir, ref + '.xml')
+
+def iterparse_compound(ref):
+	# yields each `memberdef` in the XML file of the given compound (along with the kind of its `sectiondef`), and
+	# each other child of the `compounddef`; every yielded element is then detached from the tree, so only the
+	# subtrees kept by the caller outlive the parse
+	if not low_memory:
+		# parsing the whole file at once is faster, so only stream the file when memory usage is the priority
+		compounddef = et.parse(get_xml_path(ref)).getroot().find('compounddef')
+		for child in list(compounddef):
+			if child.tag == 'sectiondef':
+				section_kind = child.attrib.get('kind')
+				for member in child.findall('memberdef'):
+					yield section_kind, member
+					child.remove(member)
+			else:
+				yield None, child
+			compounddef.remove(child)
+		return
+
+	stack, section_kind = [], None
+	for event, element in et.iterparse(get_xml_path(ref), events=('start', 'end')):
+		if event == 'start':
+			stack.append(element)
+			if len(stack) == 3 and element.tag == 'sectiondef':
+				section_kind = element.attrib.get('kind')
+			continue
+		stack.pop()
+		if len(stack) == 3 and element.tag == 'memberdef':
+			yield section_kind, element
+			stack[-1].remove(element)
+		elif len(stack) == 2:
+			if element.tag != 'sectiondef':
+				yield None, element
+			stack[-1].remove(element)
+
 def parse_class(ref):
-	tree = et.parse(os.path.sep.join(['Docs','xml', ref + '.xml']))
-	templates, template_descriptions, objects = [], [], []
+	templates, template_descriptions = [], []
+	sections = {'public-attrib' : [], 'public-func' : [], 'public-static-func' : [], 'public-type' : []}
+	for section_kind, element in iterparse_compound(ref):
+		if element.tag == 'memberdef':
+			if section_kind == 'public-attrib':
+				sections[section_kind].append(parse_variable(element))
+			elif section_kind == 'public-func' or section_kind == 'public-static-func':
+				sections[section_kind].append(parse_function(element))
+			elif section_kind == 'public-type':
+				sections[section_kind].append(parse_typedef(element))
+		elif element.tag == 'compoundname':
+			name, name_text, namespace = parse_compound_name(element.text)
+		elif element.tag == 'detaileddescription':
+			description_element = element
+		elif element.tag == 'location':
+			location_attrib = element.attrib
+		elif element.tag == 'templateparamlist':
+			for template_param in element.findall('param'):
+				type = ''.join(template_param.find('type').itertext())
+				declname_element = template_param.find('declname')
+				type += ' '+declname_element.text if declname_element != None else ''
+				default_value_element = template_param.find('defval')
+				default_value = default_value_element.text if default_value_element != None else None
+				templates.append(TemplateParam(type, default_value))
 
-	name, name_text, namespace = parse_compound_name(tree.find('compounddef/compoundname').text)
-	description_element = tree.find('compounddef/detaileddescription')
-	class_description = description_element
-	location_attrib = tree.find('compounddef/location').attrib
 	location = Location(location_attrib['bodyfile'], int(location_attrib['bodystart']), int(location_attrib['bodyend']))
-	for template_param in tree.findall('compounddef/templateparamlist/param'):
-		type = ''.join(template_param.find('type').itertext())
-		declname_element = template_param.find('declname')
-		type += ' '+declname_element.text if declname_element != None else ''
-		default_value_element = template_param.find('defval')
-		default_value = default_value_element.text if default_value_element != None else None
-		templates.append(TemplateParam(type, default_value))
 	for template_description in description_element.findall('parameterlist/parameteritem'):
 		tname = template_description.find('parameternamelist/parametername').text
 		description = template_description.find('parameterdescription').text
 		template_descriptions.append(ParamDescription(tname, description))
-	for member in tree.findall('compounddef/sectiondef[@kind=\'public-attrib\']/memberdef'):
-		objects.append(parse_variable(member))
-	for member in tree.findall('compounddef/sectiondef[@kind=\'public-func\']/memberdef'):
-		objects.append(parse_function(member))
-	for member in tree.findall('compounddef/sectiondef[@kind=\'public-static-func\']/memberdef'):
-		objects.append(parse_function(member))
-	for member in tree.findall('compounddef/sectiondef[@kind=\'public-type\']/memberdef'):
-		objects.append(parse_typedef(member))
-	cls = Class(name, name_text, namespace, templates, class_description, template_descriptions, objects, location)
+	objects = sections['public-attrib'] + sections['public-func'] + sections['public-static-func'] + sections['public-type']
+	cls = Class(name, name_text, namespace, templates, pack(description_element), template_descriptions, objects, location)
 	refs[ref] = cls
 	return cls
 
-def add_to_file(obj, files):
+def add_to_file(obj, files, compound_ref):
 	if obj.location.path not in files:
 		files[obj.location.path] = File()
-	files[obj.location.path].objects.append(obj)
-
-def parse_file(file_ref, files):
-	tree = et.parse(os.path.sep.join(['Docs','xml', file_ref + '.xml']))
-	path = get_path(tree.find('compounddef/location').attrib['file'])
-	if path not in files:
-		files[path] = File()
-	file = files[path]
-	refs[file_ref] = file
+	file = files[obj.location.path]
+	file.objects.append(obj)
+	if compound_ref not in file.compounds:
+		file.compounds.append(compound_ref)
+
+def parse_member(member):
+	if member.attrib['kind'] == 'function':
+		return parse_function(member)
+	elif member.attrib['kind'] == 'variable':
+		return parse_variable(member)
+	elif member.attrib['kind'] == 'typedef':
+		return parse_typedef(member)
+	elif member.attrib['kind'] == 'define':
+		return parse_variable(member)
+	return None
+
+class ParsedCompound:
+	# the objects parsed from a single compound XML file, which are added to the files by `add_compound`
+	__slots__ = ('kind', 'ref', 'path', 'description', 'objects', 'refs')
+
+	def __init__(self, kind, ref):
+		self.kind = kind
+		self.ref = ref
+		self.path = None	# the file containing the objects of 'file' and 'page' compounds
+		self.description = None
+		self.objects = []
+		self.refs = {}	# the refid's of the members of this compound
+
+def parse_file(compound):
+	description_element = None
+	for section_kind, element in iterparse_compound(compound.ref):
+		if element.tag == 'memberdef':
+			obj = parse_member(element)
+			if obj != None:
+				compound.objects.append(obj)
+		elif element.tag == 'detaileddescription':
+			description_element = element
+		elif element.tag == 'location':
+			compound.path = get_path(element.attrib['file'])
 
 	# read per-file comments
-	description_element = tree.find('compounddef/detaileddescription')
 	if description_element != None:
-		file.description = description_element
-
-	for member in tree.findall('compounddef/sectiondef/memberdef'):
-		if member.attrib['kind'] == 'function':
-			file.objects.append(parse_function(member))
-		elif member.attrib['kind'] == 'variable':
-			file.objects.append(parse_variable(member))
-		elif member.attrib['kind'] == 'typedef':
-			file.objects.append(parse_typedef(member))
-		elif member.attrib['kind'] == 'define':
-			file.objects.append(parse_variable(member))
-
-def parse_readme(page_ref):
-	tree = et.parse(os.path.sep.join(['Docs','xml', page_ref + '.xml']))
-	return tree.find('compounddef/detaileddescription')
-
-def parse_namespace(namespace_ref, files):
-	tree = et.parse(os.path.sep.join(['Docs','xml', namespace_ref + '.xml']))
-	for member in tree.findall('compounddef/sectiondef/memberdef'):
-		if member.attrib['kind'] == 'function':
-			add_to_file(parse_function(member), files)
-		elif member.attrib['kind'] == 'variable':
-			add_to_file(parse_variable(member), files)
-		elif member.attrib['kind'] == 'typedef':
-			add_to_file(parse_typedef(member), files)
-		elif member.attrib['kind'] == 'define':
-			add_to_file(parse_variable(member), files)
+		compound.description = pack(description_element)
+
+def parse_readme(compound):
+	description_element = None
+	for section_kind, element in iterparse_compound(compound.ref):
+		if element.tag == 'detaileddescription':
+			description_element = element
+	compound.description = pack(description_element)
+
+def parse_namespace(compound):
+	for section_kind, element in iterparse_compound(compound.ref):
+		if element.tag == 'memberdef':
+			obj = parse_member(element)
+			if obj != None:
+				compound.objects.append(obj)
+
+def read_index():
+	# returns the refid and name of each file, namespace, struct, and page compound listed in 'index.xml'
+	compounds = {'file' : [], 'namespace' : [], 'struct' : [], 'page' : []}
+	for event, element in et.iterparse(get_xml_path('index')):
+		if element.tag == 'compound':
+			if element.attrib['kind'] in compounds:
+				compounds[element.attrib['kind']].append((element.attrib['refid'], element.find('name').text))
+			element.clear()
+	return compounds
+
+def get_page_path(filename):
+	# decodes the path of a markdown page from its Doxygen name
+	filename = filename[3:]
+	i = 0
+	new_filename = []
+	while i < len(filename):
+		if filename[i] == '_':
+			if filename[i+1] == '2':
+				new_filename.append(os.path.sep)
+			else:
+				new_filename.append(filename[i+1].upper())
+			i += 2
+			continue
+		new_filename.append(filename[i])
+		i += 1
+	return get_path(''.join(new_filename) + '.md')
+
+def read_compound(compound):
+	global refs
+	# the members of the compound are recorded separately, so that the compound can be reused without re-parsing
+	all_refs, refs = refs, compound.refs
+	try:
+		if compound.kind == 'file':
+			parse_file(compound)
+		elif compound.kind == 'namespace':
+			parse_namespace(compound)
+		elif compound.kind == 'struct':
+			compound.objects.append(parse_class(compound.ref))
+		else:
+			parse_readme(compound)
+	finally:
+		refs = all_refs
+
+def iter_subtrees(compound):
+	# yields the object and attribute name of each Doxygen XML subtree of the compound that is needed for rendering
+	yield compound, 'description'
+	objects = list(compound.objects)
+	while objects:
+		obj = objects.pop(0)
+		yield obj, 'description'
+		if isinstance(obj, Class):
+			objects[:0] = obj.objects
+			continue
+		yield obj, 'type'
+		if isinstance(obj, Function):
+			for arg in obj.args:
+				yield arg, 'type'
+		elif isinstance(obj, Typedef):
+			yield obj, 'args'
+
+def drop_subtrees(compound):
+	# replaces the subtrees of the compound by `LazyElement` objects; only the subtrees used in signatures keep their text
+	for index, (obj, name) in enumerate(iter_subtrees(compound)):
+		element = getattr(obj, name)
+		if element != None:
+			setattr(obj, name, LazyElement(compound.kind, compound.ref, index, element, name != 'description'))
+
+def read_subtrees(kind, ref):
+	# re-parses the given compound, and returns its subtrees in the order of `iter_subtrees`
+	compound = ParsedCompound(kind, ref)
+	read_compound(compound)
+	return [getattr(obj, name) for obj, name in iter_subtrees(compound)]
+
+def parse_compound(kind, ref, name):
+	# returns the `ParsedCompound` of the given compound, or None if it is a page other than a markdown file
+	if kind == 'page' and name.find('md_') != 0:
+		return None
+	compound = ParsedCompound(kind, ref)
+	if kind == 'page':
+		compound.path = get_page_path(name)
+	with profiler.compound(ref):
+		read_compound(compound)
+		if lazy_load:
+			drop_subtrees(compound)
+	return compound
+
+def add_compound(compound, files):
+	refs.update(compound.refs)
+	if compound.kind == 'file':
+		if compound.path not in files:
+			files[compound.path] = File()
+		file = files[compound.path]
+		file.compounds.append(compound.ref)
+		refs[compound.ref] = file
+		if compound.description != None:
+			file.description = compound.description
+		file.objects.extend(compound.objects)
+	elif compound.kind == 'page':
+		files[compound.path] = File()
+		files[compound.path].description = compound.description
+		files[compound.path].compounds.append(compound.ref)
+	else:
+		for obj in compound.objects:
+			add_to_file(obj, files, compound.ref)
 
 def parse_index(files):
-	tree = et.parse(os.path.sep.join(['Docs','xml','index.xml']))
-	for file in tree.findall('compound[@kind=\'file\']'):
-		parse_file(file.attrib['refid'], files)
-	for namespace in tree.findall('compound[@kind=\'namespace\']'):
-		parse_namespace(namespace.attrib['refid'], files)
-	for struct in tree.findall('compound[@kind=\'struct\']'):
-		add_to_file(parse_class(struct.attrib['refid']), files)
-	for page in tree.findall('compound[@kind=\'page\']'):
-		filename = page.find('name').text
-		if filename.find('md_') == 0:
-			filename = filename[3:]
-			i = 0
-			new_filename = []
-			while i < len(filename):
-				if filename[i] == '_':
-					if filename[i+1] == '2':
-						new_filename.append(os.path.sep)
-					else:
-						new_filename.append(filename[i+1].upper())
-					i += 2
+	parse_compounds(read_index(), files)
+
+def get_compound_repository(kind, ref, name):
+	# returns the repository containing the given compound (without parsing it), or None if it may span repositories
+	if kind == 'namespace':
+		return None
+	elif kind == 'page':
+		return os_path_sunder(get_page_path(name))[0] if name.find('md_') == 0 else None
+	for event, element in et.iterparse(get_xml_path(ref), events=('start',)):
+		if element.tag == 'location' and 'file' in element.attrib:
+			return os_path_sunder(get_path(element.attrib['file']))[0]
+	return None
+
+def load_packed_element(data, length):
+	packed = PackedElement.__new__(PackedElement)
+	packed.data = data
+	packed.length = length
+	return packed
+
+def get_element_state(element):
+	return (element.tag, element.attrib, element.text, element.tail, [get_element_state(child) for child in element])
+
+def load_element(state):
+	tag, attrib, text, tail, children = state
+	element = et.Element(tag, attrib)
+	element.text = text
+	element.tail = tail
+	element.extend(load_element(child) for child in children)
+	return element
+
+def reduce_element(element):
+	# the elements are cached (and loaded) as `PackedElement` objects, so they are only parsed if they are needed,
+	# which is much faster than unpickling every node
+	data = serialize_element(element)
+	if et is std_et and b'\r' in data:
+		# ElementTree doesn't escape carriage returns in text, so they wouldn't survive parsing (see `pack`)
+		return load_element, (get_element_state(element),)
+	return load_packed_element, (data, len(element))
+
+copyreg.pickle(std_et.Element, reduce_element)
+if lxml != None:
+	copyreg.pickle(lxml.etree._Element, reduce_element)
+
+def get_cache_version():
+	# the parsed compounds depend on the version of this script and on the settings used to parse them (the classes
+	# of the pickled objects are looked up in this module, whose name depends on whether it is run as a script)
+	return md5_string(generator_hash + __name__ + et.__name__ + str(low_memory) + str(lazy_load) + src_root)
+
+def get_cache_file(kind, ref, name):
+	key = md5_string('\n'.join([get_cache_version(), kind, ref, name, get_compound_hash(ref)]))
+	return os.path.join(cache_dir, key + '.pickle')
+
+def load_compound(kind, ref, name):
+	# returns the `ParsedCompound` of the given compound, from the compound cache if possible
+	if cache_dir == None:
+		return parse_compound(kind, ref, name)
+	cache_file = get_cache_file(kind, ref, name)
+	try:
+		with open(cache_file, 'rb') as f:
+			compound = pickle.load(f)
+		# mark the entry as recently used
+		os.utime(cache_file)
+		return compound
+	except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+		pass
+	compound = parse_compound(kind, ref, name)
+	if compound != None:
+		write_file(cache_file, pickle.dumps(compound, pickle.HIGHEST_PROTOCOL))
+	return compound
+
+def evict_cache():
+	# removes the least recently used entries of the compound cache until it fits in `cache_size`
+	try:
+		entries = [entry for entry in os.scandir(cache_dir) if entry.name.endswith('.pickle')]
+	except OSError:
+		return
+	entries = sorted(((entry.stat().st_mtime, entry.stat().st_size, entry.path) for entry in entries), reverse=True)
+	total = 0
+	for mtime, size, path in entries:
+		total += size
+		if total > cache_size * 2**20:
+			os.remove(path)
+
+def load_compound_task(task):
+	# returns the `ParsedCompound` of the given compound (or None if it is a page other than a markdown file), along
+	# with the time it took to parse, or None if the compound belongs to another repository than `repository`
+	kind, ref, name, repository = task
+	if repository != None and get_compound_repository(kind, ref, name) not in [None, repository]:
+		return None
+	compound = load_compound(kind, ref, name)
+	return compound, profiler.compound_times.pop(ref, None)
+
+def map_forked(function, items, jobs, ordered=True):
+	# returns the result of the function for each of the given items, which are processed by up to `jobs` forked
+	# worker processes (which inherit the module globals), or by this process if forking isn't supported; the results
+	# are in the same order as the items, unless `ordered` is False
+	if jobs > 1 and len(items) > 1 and 'fork' in multiprocessing.get_all_start_methods():
+		chunksize = max(1, len(items) // (jobs * 8))
+		with multiprocessing.get_context('fork').Pool(jobs) as pool:
+			return pool.map(function, items, chunksize) if ordered else list(pool.imap_unordered(function, items, chunksize))
+	return [function(item) for item in items]
+
+def load_compounds(tasks, jobs):
+	# returns the result of `load_compound_task` for each of the given tasks, in the same order
+	# (the compounds are parsed independently, and returned to the main process by pickling, see `reduce_element`)
+	return map_forked(load_compound_task, tasks, jobs)
+
+def parse_compounds(compounds, files, parsed=None, repository=None, jobs=1):
+	# parses the given compounds (using `jobs` worker processes) and adds their objects to `files`; if `parsed` is
+	# given, it maps the refid of each compound to its `ParsedCompound`, which are reused rather than re-parsed; if
+	# `repository` is given, the files and structs of other repositories are skipped
+	tasks = []
+	for kind in ['file', 'namespace', 'struct', 'page']:
+		for ref, name in compounds[kind]:
+			if parsed == None or ref not in parsed:
+				tasks.append((kind, ref, name, repository))
+	results = iter(load_compounds(tasks, jobs))
+
+	# the compounds are added in the order of the index, regardless of which process parsed them
+	for kind in ['file', 'namespace', 'struct', 'page']:
+		for ref, name in compounds[kind]:
+			if parsed != None and ref in parsed:
+				compound = parsed[ref]
+			else:
+				result = next(results)
+				if result == None:
 					continue
-				new_filename.append(filename[i])
-				i += 1
-			filename = get_path(''.join(new_filename) + '.md')
-			files[filename] = File()
-			files[filename].description = parse_readme(page.attrib['refid'])
-
-def is_visible(member):
-	if isinstance(member, Class):
-		return has_visible(member.objects) or len(member.description) > 0
-	return len(member.description) > 0
+				compound, seconds = result
+				if seconds != None:
+					profiler.compound_times[ref] = seconds
+				if parsed != None:
+					parsed[ref] = compound
+			if compound != None:
+				add_compound(compound, files)
 
 def has_visible(members):
 	for member in members:
-		if is_visible(member):
+		if member.visible:
 			return True
 	return False
 
@@ -584,29 +1155,137 @@ def get_link(obj, name_prefix=""):
 	elif isinstance(obj, Typedef):
 		return urlescape('typedef ' + to_text(obj.type) + ' ' + name_prefix + obj.name + to_text(obj.args))
 
-def compute_links(members, name_prefix=""):
+def get_signature(obj, name_prefix=""):
+	if isinstance(obj, Class):
+		return 'struct ' + name_prefix + obj.name_text
+	elif isinstance(obj, Function):
+		type = ('static ' if obj.is_static else '') + (to_text(obj.type) + ' ' if obj.type != None else '')
+		const = ' const' if obj.is_const else ''
+		return type + name_prefix + obj.name_text + '(' + ', '.join(arg.to_text() for arg in obj.args) + ')' + const
+	elif isinstance(obj, Variable):
+		type = '#define' if obj.type == None else to_text(obj.type)
+		return type + ' ' + name_prefix + obj.name
+	elif isinstance(obj, Typedef):
+		return 'typedef ' + to_text(obj.type) + ' ' + name_prefix + obj.name + to_text(obj.args)
+
+def index_objects(members, name_prefix=""):
+	# computes whether each object is visible, along with the anchor link, signature, and URLs of each visible
+	# object, so that rendering only needs to read these fields; returns whether any of the objects are visible
+	any_visible = False
 	for obj in members:
-		if not is_visible(obj):
+		if isinstance(obj, Class):
+			obj.visible = index_objects(obj.objects, obj.name_text + "::") or len(obj.description) > 0
+		else:
+			obj.visible = len(obj.description) > 0
+		if not obj.visible:
 			continue
+		any_visible = True
 		obj.link = get_link(obj, name_prefix)
-		if isinstance(obj, Class):
-			compute_links(obj.objects, obj.name_text + "::")
+		obj.signature = get_signature(obj, name_prefix)
+		obj.page = obj.location.path
+		obj.url = url_root + obj.page + '.html#' + obj.link
+		obj.source_link = get_source_link(obj.location)
+	return any_visible
+
+def count_visible(members):
+	count = 0
+	for obj in members:
+		if obj.visible:
+			count += 1
+			if isinstance(obj, Class):
+				count += count_visible(obj.objects)
+	return count
+
+def set_page(obj, page):
+	obj.page = page
+	obj.url = url_root + page + '.html#' + obj.link
+	if isinstance(obj, Class):
+		for member in obj.objects:
+			if member.visible:
+				set_page(member, page)
+
+def is_split(obj):
+	# whether the given object is a struct that has its own page, rather than being rendered in the page of its file
+	return isinstance(obj, Class) and obj.page != obj.location.path
+
+def split_file(key, value, struct_pages):
+	# if the given file has more than `max_page_symbols` documented symbols, moves each of its documented structs
+	# (along with their members) to their own page, and adds the page to `struct_pages`
+	if max_page_symbols == None or count_visible(value.objects) <= max_page_symbols:
+		return
+	for obj in value.objects:
+		if not isinstance(obj, Class) or not obj.visible:
+			continue
+		page = key + '.struct_' + (re.sub('[^A-Za-z0-9_]+', '_', obj.name_text).strip('_') or 'anonymous')
+		suffix = 1
+		while page + ('_' + str(suffix) if suffix > 1 else '') in struct_pages:
+			suffix += 1
+		page += '_' + str(suffix) if suffix > 1 else ''
+		set_page(obj, page)
+		struct_pages[page] = (key, obj)
+
+class Template:
+	# a template that is split into its fixed text and its slots (`$name`) once, so that it is rendered with a single join
+	__slots__ = ('text', 'parts', 'slots')
+
+	def __init__(self, text, names):
+		self.text = text
+		self.parts = []
+		self.slots = []	# the index in `parts` and the name of each slot
+		position = 0
+		if len(names) > 0:
+			for match in re.finditer(r'\$(' + '|'.join(sorted(names, key=len, reverse=True)) + r')(?!\w)', text):
+				self.parts.append(text[position:match.start()])
+				self.slots.append((len(self.parts), match.group(1)))
+				self.parts.append(None)
+				position = match.end()
+		self.parts.append(text[position:])
+
+	def render(self, **values):
+		parts = self.parts[:]
+		for index, name in self.slots:
+			parts[index] = values[name]
+		return ''.join(parts)
+
+# the default markup of the pages, which can be overridden by the files in `template_dir` (e.g. 'member_row.html');
+# the slots of each template are the `$name`s in its default markup
+default_markup = {
+	'page' : '$header<nav id="leftnav"><div id="menu"$menu_attributes>$search<ul>$nav</ul></div></nav><div id="container"><div class="title h1">$title$source</div>'
+		'<div id="embedded_nav"></div>$contents</div><nav id="rightnav"><div id="toc"><div id="toc_title"><b>Table of contents</b></div><ul>$toc</ul></div></nav>$style$footer',
+	'member_table' : '<a class="anchor" id="$link"></a><table class="table members"><colgroup><col class="type-col" /><col class="name-col" /></colgroup>'
+		'<tr><th colspan="2">$title</th></tr>$rows</table>$pager',
+	'member_row' : '<tr class="active"><td class="type-col">$left</td><td class="name-col">$right</td></tr>',
+	'table_page' : '<tbody class="table-page"$style>$rows</tbody>',
+	'table_pager' : '<div class="table-pager">$links</div>',
+	'struct_panel' : '<a class="anchor" id="$link"></a><div class="$classes"><h2>struct $name<div class="source">[<a href="$source_link" target="_blank">view source</a>]</div></h2>'
+		'$templates$description$members</div>',
+	'typedef_panel' : '<a class="anchor" id="$link"></a><div class="$classes"><div class="panel-heading">typedef $declaration'
+		'<div class="source">[<a href="$source_link" target="_blank">view source</a>]</div></div><div class="panel-body">$description</div></div>',
+	'member_panel' : '<a class="anchor" id="$link"></a><div class="$classes"><div class="panel-heading"><div class="source">[<a href="$source_link" target="_blank">view source</a>]</div>'
+		'$templates$type $name$args</div><div class="panel-body">$description</div></div>',
+	'contents_nav' : '<li><a class="active" href="#$link">File contents</a></li>',
+	'members_nav' : '<li><a href="#$link">Members</a></li>',
+	'struct_nav' : '<li><a href="#$link">struct $name</a>$members</li>',
+	'typedef_nav' : '<li><a href="#$link">typedef $name</a></li>',
+	'member_nav' : '<li><a href="#$link">$type $name$args</a></li>',
+	'nav_directory' : '<li><div class="$classes">$toggler$name</div><ul class="tree"$style>$children</ul></li>',
+	'nav_file' : '<li class="toc_item"><a href="$link">$name</a></li>',
+	'nav_current_file' : '<li class="toc_item active">$name</li>',
+	'mathjax' : '<script type="text/x-mathjax-config">MathJax.Hub.Config({tex2jax: {inlineMath: [[\'$\',\'$\']]}});</script>'
+		'<script type="text/javascript" async src="https://cdnjs.cloudflare.com/ajax/libs/mathjax/2.7.1/MathJax.js?config=TeX-AMS_SVG"></script>'
+}
 
 def generate_member_table(out, name, nav, members, title, name_prefix=""):
 	link = 'table_' + name_prefix
-	if name is None:
-		nav.write('<li><a class="active" href="#' + link + '">File contents</a></li>')
-	else:
-		nav.write('<li><a href="#' + link + '">Members</a></li>')
-	out.write('<a class="anchor" id="' + link + '"></a>')
-	out.write('<table class="table members"><colgroup><col class="type-col" /><col class="name-col" /></colgroup><tr><th colspan="2">' + title + '</th></tr>')
+	nav.write(markup['contents_nav' if name is None else 'members_nav'].render(link=link))
+	rows = []
 	for obj in members:
 		left, right = '', ''
-		if not is_visible(obj):
+		if not obj.visible:
 			continue
 		if isinstance(obj, Class):
 			left += 'struct'
-			right += '<a href="#' + obj.link + '"><b>' + obj.name + '</b></a>'
+			right += '<a href="' + (obj.url if is_split(obj) else '#' + obj.link) + '"><b>' + obj.name + '</b></a>'
 		elif isinstance(obj, Function):
 			left += 'static ' if obj.is_static else ''
 			left += to_html(obj.type) if obj.type != None else ''
@@ -624,8 +1303,17 @@ def generate_member_table(out, name, nav, members, title, name_prefix=""):
 			right += '<a href="#' + obj.link + '"><b>' + obj.name + '</b></a>'
 			if index != -1:
 				right += type[(index+1):] + to_html(obj.args)
-		out.write('<tr class="active"><td class="type-col">' + left + '</td><td class="name-col">' + right + '</td></tr>')
-	out.write('</table>')
+		rows.append(markup['member_row'].render(left=left, right=right))
+	pager = ''
+	if max_table_rows != None and len(rows) > max_table_rows:
+		# only the first page of rows is displayed (and laid out) until another page is selected in the pager
+		pages, links = [], []
+		for i in range(0, len(rows), max_table_rows):
+			pages.append(markup['table_page'].render(style=(' style="display:none"' if i > 0 else ''), rows=''.join(rows[i:(i+max_table_rows)])))
+			links.append('<a href="#"' + (' class="active"' if i == 0 else '') + '>' + str(i // max_table_rows + 1) + '</a>')
+		rows = pages
+		pager = markup['table_pager'].render(links=''.join(links))
+	out.write(markup['member_table'].render(link=link, title=title, rows=''.join(rows), pager=pager))
 
 def templates_to_html(templates):
 	if len(templates) == 0:
@@ -643,43 +1331,36 @@ def templates_to_html(templates):
 		params.append('<span class="arg">' + param + '</span>')
 	return '<div class="template">template&lt;' + ', '.join(params) + '&gt;</div>'
 
-def generate_member_list(out, nav, members, name_prefix=""):
+def generate_member_list(out, nav, members, name_prefix="", page=None):
+	# the structs that have their own page are only rendered in that page (see `split_file`)
 	is_first = True
 	for obj in members:
-		if not is_visible(obj):
+		if not obj.visible or (is_split(obj) and obj.page != page):
 			continue
-		out.write('<a class="anchor" id="' + obj.link + '"></a>')
-		source_link = get_source_link(obj.location)
+		source_link = obj.source_link
 		panel_classes = 'panel panel-default panel-first active' if is_first else 'panel panel-default active'
 		is_first = False
 		if isinstance(obj, Class):
-			nav.write('<li><a href="#' + obj.link + '">struct ' + obj.name + '</a>')
-			out.write('<div class="' + panel_classes + '"><h2>struct ' + obj.name)
-			out.write('<div class="source">[<a href="' + source_link + '" target="_blank">view source</a>]</div></h2>')
-			out.write(templates_to_html(obj.templates))
-			description = to_html(obj.description)
-			if len(description) > 0:
-				out.write(description)
+			member_out, member_nav = StringIO(), StringIO()
 			if has_visible(obj.objects):
-				nav.write('<ul>')
 				namespace = name_prefix + obj.name + "::"
-				generate_member_table(out, obj.name, nav, obj.objects, 'Public members', namespace)
-				generate_member_list(out, nav, obj.objects, namespace)
-				nav.write('</ul>')
-			nav.write('</li>')
-			out.write('</div>')
+				member_nav.write('<ul>')
+				generate_member_table(member_out, obj.name, member_nav, obj.objects, 'Public members', namespace)
+				generate_member_list(member_out, member_nav, obj.objects, namespace)
+				member_nav.write('</ul>')
+			nav.write(markup['struct_nav'].render(link=obj.link, name=obj.name, members=member_nav.getvalue()))
+			out.write(markup['struct_panel'].render(link=obj.link, classes=panel_classes, name=obj.name, source_link=source_link,
+				templates=templates_to_html(obj.templates), description=to_html(obj.description), members=member_out.getvalue()))
+			member_out.close()
+			member_nav.close()
 		elif isinstance(obj, Typedef):
 			typedef = to_html(obj.type)
 			if '()' in typedef:
 				typedef = typedef.replace('()', '(' + name_prefix + obj.name + ')') + to_html(obj.args)
 			else:
 				typedef += ' ' + name_prefix + obj.name
-			nav.write('<li><a href="#' + obj.link + '">typedef ' + obj.name + '</a>')
-			out.write('<div class="' + panel_classes + '"><div class="panel-heading">typedef ')
-			out.write(typedef + '<div class="source">[<a href="' + source_link + '" target="_blank">view source</a>]</div></div><div class="panel-body">')
-			out.write(to_html(obj.description))
-			nav.write('</li>')
-			out.write('</div></div>')
+			nav.write(markup['typedef_nav'].render(link=obj.link, name=obj.name))
+			out.write(markup['typedef_panel'].render(link=obj.link, classes=panel_classes, declaration=typedef, source_link=source_link, description=to_html(obj.description)))
 		else:
 			if obj.type == None:
 				type = '#define' if isinstance(obj, Variable) else ''
@@ -690,70 +1371,78 @@ def generate_member_list(out, nav, members, name_prefix=""):
 			if isinstance(obj, Function) and obj.is_static:
 				type = 'static ' + type
 				type_text = 'static ' + type_text
-			nav.write('<li><a href="#' + obj.link + '">' + ('' if isinstance(obj, Variable) else type_text) + ' ' + obj.name)
-			out.write('<div class="' + panel_classes + '"><div class="panel-heading">')
-			out.write('<div class="source">[<a href="' + source_link + '" target="_blank">view source</a>]</div>')
-			if isinstance(obj, Function):
-				out.write(templates_to_html(obj.templates))
-			out.write(type + ' ' + name_prefix + obj.name)
+			args, args_text = '', ''
 			if isinstance(obj, Function):
 				if obj.name.find('operator') == 0:
-					nav.write(' ')
-					out.write(' ')
+					args, args_text = ' ', ' '
 				if len(obj.args) == 0:
-					nav.write('()')
-					out.write('()')
+					args += '()'
+					args_text += '()'
 				else:
-					nav.write('( ' + ', '.join(['<span class="arg">'+to_htmltext(arg.type)+'</span>' for arg in obj.args]) + ')')
-					out.write('(<table class="memname params">')
+					args_text += '( ' + ', '.join(['<span class="arg">'+to_htmltext(arg.type)+'</span>' for arg in obj.args]) + ')'
+					args += '(<table class="memname params">'
 					for arg in obj.args[:-1]:
 						default = ' = '+arg.default_value if arg.default_value != None else ''
-						out.write('<tr><td class="paramtype">' + to_html(arg.type) + '</td><td class="paramname">' + arg.name + '<span class="black">' + default + ',</span></td></tr>')
+						args += '<tr><td class="paramtype">' + to_html(arg.type) + '</td><td class="paramname">' + arg.name + '<span class="black">' + default + ',</span></td></tr>'
 					default = '<span class="black"> = '+obj.args[-1].default_value+'</span>' if obj.args[-1].default_value != None else ''
 					const = ' const' if obj.is_const else ''
-					out.write('<tr><td class="paramtype">' + to_html(obj.args[-1].type) + '</td><td class="paramname">' + obj.args[-1].name + default + '</td><td>)' + const + '</td></tr>')
-					out.write('</table>')
+					args += '<tr><td class="paramtype">' + to_html(obj.args[-1].type) + '</td><td class="paramname">' + obj.args[-1].name + default + '</td><td>)' + const + '</td></tr>'
+					args += '</table>'
 			elif isinstance(obj, Variable):
 				if obj.initializer != None:
-					out.write(' ' + obj.initializer)
-			nav.write('</a></li>')
-			out.write('</div><div class="panel-body">')
-			out.write(to_html(obj.description))
-			out.write('</div></div>')
+					args = ' ' + obj.initializer
+			nav.write(markup['member_nav'].render(link=obj.link, type=('' if isinstance(obj, Variable) else type_text), name=obj.name, args=args_text))
+			out.write(markup['member_panel'].render(link=obj.link, classes=panel_classes, source_link=source_link,
+				templates=(templates_to_html(obj.templates) if isinstance(obj, Function) else ''), type=type, name=name_prefix + obj.name, args=args,
+				description=to_html(obj.description)))
+
+def get_nav_name(key, path):
+	# returns the name of the given entry of the navigation tree; the pages of the structs that were split from their
+	# files (see `split_file`) are listed after their files, as 'struct NAME'
+	file_key, separator, name = key.rpartition('.struct_')
+	if separator and file_key in path.children and path.children[file_key].is_file():
+		return 'struct ' + name
+	return key
 
 def generate_left_nav(out, path, current_sundered_path):
 	on_path = (current_sundered_path != None)
 	for key in sorted(path.children.keys()):
 		child_path = path.children[key]
-		child_on_path = on_path and (current_sundered_path[0] == key)
-		if not child_path.is_file():
-			# this is a directory
-			toggler_style = 'tree-toggler' if child_path.is_visible else 'invisible tree-toggler'
-			toggler = '<label class="' + toggler_style + '">' + ('-' if child_on_path else '+') + '</label>'
-			tree_ul = ('<ul class="tree"' + (' style="display:none"' if not child_on_path else '') + '>') if True else ''
-			if 'README.md' in child_path.children:
-				child = child_path.children['README.md']
-				if child_on_path and current_sundered_path[1] == 'README.md':
-					out.write('<li><div class="toc_item active">' + toggler + key + '</div>' + tree_ul)
-				else:
-					link = url_root + os.path.split(child_path.children['README.md'].object)[0] + '/index.html'
-					out.write('<li><div class="toc_item">' + toggler + '<a href="' + link + '">' + key + '</a></div>' + tree_ul)
-			else:
-				out.write('<li><div class="toc_item">' + toggler + key + '</div>' + tree_ul)
-			generate_left_nav(out, child_path, current_sundered_path[1:] if (on_path and child_on_path) else None)
-			out.write('</ul></li>')
+		if on_path and current_sundered_path[0] == key:
+			generate_left_nav_item(out, key, child_path, current_sundered_path[1:], get_nav_name(key, path))
 		else:
-			# this is a file
-			if child_path.object == None or not child_path.is_visible:
-				continue
-			if child_on_path:
-				out.write('<li class="toc_item active">' + key + '</li>')
+			# entries that are not on the path to the current page are identical on every page, so render them only once
+			if child_path.nav_html == None:
+				item = StringIO()
+				generate_left_nav_item(item, key, child_path, None, get_nav_name(key, path))
+				child_path.nav_html = item.getvalue()
+				item.close()
+			out.write(child_path.nav_html)
+
+def generate_left_nav_item(out, key, path, current_sundered_path, name):
+	on_path = (current_sundered_path != None)
+	if not path.is_file():
+		# this is a directory
+		toggler_style = 'tree-toggler' if path.is_visible else 'invisible tree-toggler'
+		toggler = '<label class="' + toggler_style + '">' + ('-' if on_path else '+') + '</label>'
+		classes, name = 'toc_item', key
+		if 'README.md' in path.children:
+			if on_path and current_sundered_path[0] == 'README.md':
+				classes = 'toc_item active'
 			else:
-				link = child_path.object + '.html'
-				out.write('<li class="toc_item"><a href="' + url_root + link + '">' + key + '</a></li>')
-
-def generate_right_nav(out, nav, members):
-	out.write('<nav id="rightnav">' + nav.getvalue() + '</nav>')
+				name = '<a href="' + url_root + os.path.split(path.children['README.md'].object)[0] + '/index.html' + '">' + key + '</a>'
+		children = StringIO()
+		generate_left_nav(children, path, current_sundered_path)
+		out.write(markup['nav_directory'].render(classes=classes, toggler=toggler, name=name, style=('' if on_path else ' style="display:none"'), children=children.getvalue()))
+		children.close()
+	else:
+		# this is a file
+		if path.object == None or not path.is_visible:
+			return
+		if on_path:
+			out.write(markup['nav_current_file'].render(name=name))
+		else:
+			out.write(markup['nav_file'].render(link=url_root + path.object + '.html', name=name))
 
 # see: https://stackoverflow.com/questions/4579908/cross-platform-splitting-of-path-in-python
 def os_path_sunder(path):
@@ -774,6 +1463,7 @@ class Path:
 		self.children = (None if is_file else {})
 		self.object = object
 		self.is_visible = is_visible
+		self.nav_html = None	# the rendered left navigation entry, when it is not on the path to the current page
 
 	def is_file(self):
 		return self.children == None
@@ -794,84 +1484,1254 @@ class Path:
 		else:
 			return self.children[path[0]].get(path[1:])
 
-# clean destination directory
-rmtree('Docs/html', True)
-
-# read the header and footer files
-style_hash = md5_hash(style_file)
-script_hash = md5_hash(script_file)
-hamburger_hash = md5_hash(hamburger_file)
-with open(header_file, 'r') as f:
-	header = f.read()
-	header = header.replace('$style_file', url_root + style_file + '?' + style_hash)
-	header = header.replace('$hamburger_file', url_root + hamburger_file + '?' + hamburger_hash)
-with open(footer_file, 'r') as f:
-	footer = f.read()
-	footer = footer.replace('$script_file', url_root + script_file + '?' + script_hash)
-	footer = footer.replace('$style_file', url_root + style_file + '?' + style_hash)
-
-# read 'index.xml'
-files = {}
-parse_index(files)
-
-# sort objects in each file by line number, and construct the path tree structure
-root = Path(False, None)
-for key, value in files.items():
-	value.objects.sort(key=lambda obj : obj.location.start)
-	compute_links(value.objects)
-	value.link = url_root + key + '.html'
-	root.add(os_path_sunder(key), key, has_visible(value.objects))
-
-# generate html output
-for key, value in files.items():
-	sundered = os_path_sunder(key)
+def get_output_path(key, value):
 	directory, filename = os.path.split(key)
 	if filename == 'README.md' and len(value.description) > 0:
 		filepath = os.path.sep.join([directory, 'index'])
-	elif not has_visible(value.objects):
-		continue
+	elif not value.visible:
+		return None
 	else:
 		filepath = os.path.sep.join([directory, filename])
+	return os.path.join(html_dir, filepath + '.html')
+
+def get_relative_root(filepath):
+	# returns the relative URL of the root of the site from the given output file
+	path = os.path.relpath(html_dir, os.path.dirname(filepath))
+	return './' if path == '.' else path.replace(os.path.sep, '/') + '/'
+
+def make_relative(data, filepath):
+	# replaces the absolute URLs of the pages and assets in the given output file by relative ones
+	root = get_relative_root(filepath)
+	return data.replace('"' + url_root, '"' + root).replace('\'' + url_root, '\'' + root)
+
+class PageStats:
+	# the statistics of the generation of a single page, which are returned by the worker processes
+	__slots__ = ('key', 'written', 'cache_hits', 'cache_misses', 'render_time', 'render_peak', 'write_time', 'write_peak')
+
+	def __init__(self, key):
+		self.key = key
+		self.written = False	# False if the page already existed with the same contents
+		self.cache_hits = self.cache_misses = 0
+		self.render_time = self.render_peak = self.write_time = self.write_peak = 0
+
+def get_peak_memory():
+	return tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else 0
+
+def reset_peak_memory():
+	if tracemalloc.is_tracing():
+		tracemalloc.reset_peak()
+
+unrendered_formula = re.compile('<(?:span|div) class="formula">')
+
+def generate_page(key):
+	stats = PageStats(key)
+	hits, misses = render_cache.hits, render_cache.misses
+	reset_peak_memory()
+	start = time.perf_counter()
+	if key in struct_pages:
+		# this is the page of a struct that was split from its file (see `split_file`)
+		file_key, struct = struct_pages[key]
+	else:
+		file_key, struct = key, None
+	value = files[file_key]
+	sundered = os_path_sunder(file_key)
+	filename = os.path.split(file_key)[1]
+	filepath = get_output_path(key, value)
+	title = key if struct == None else 'struct ' + struct.name + ' in ' + file_key
+	page_header = markup['header'].render(title=title + ' Documentation', navbar_title=sundered[0] + ' Documentation')
+
+	if shared_nav:
+		page_url = url_root + (os.path.split(file_key)[0] + '/index.html' if filename == 'README.md' else key + '.html')
+		menu_attributes = ' data-nav="' + url_root + 'nav.html?' + nav_hash + '" data-page="' + page_url + '"'
+		left_nav = ''
+	else:
+		menu_attributes = ''
+		out = StringIO()
+		generate_left_nav(out, root, os_path_sunder(key))
+		left_nav = out.getvalue()
+		out.close()
 
-	filepath = os.path.sep.join(['Docs', 'html', filepath + '.html'])
-	os.makedirs(os.path.dirname(filepath), exist_ok=True)
-	out = open(filepath, 'w')
-	out.write(header.replace('$title', key + ' Documentation').replace('$navbar_title', sundered[0] + ' Documentation'))
-
-	out.write('<nav id="leftnav"><div id="menu"><ul>')
-	generate_left_nav(out, root, sundered)
-	out.write('</ul></div></nav>')
-
-	out.write('<div id="container">')
 	title = filename if filename != 'README.md' else sundered[0]
-	out.write('<div class="title h1">' + title)
-	if filename != 'README.md':
-		out.write('<div class="source">[<a href="' + get_file_link(sundered) + '" target="_blank">view source</a>]</div>')
-	out.write('</div><div id="embedded_nav"></div>')
-
-	if value.description != None:
-		out.write(to_html(value.description))
-
-	# generate the summary table
-	nav = StringIO()
-	nav.write('<div id="toc"><div id="toc_title"><b>Table of contents</b></div><ul>')
-	if filename != 'README.md':
-		generate_member_table(out, None, nav, value.objects, 'Classes, functions, and variables in this file')
-
-	# generate detailed entries for each object in the file
-	generate_member_list(out, nav, value.objects)
-
-	out.write('</div>')
-	nav.write('</ul></div>')
-	generate_right_nav(out, nav, value.objects)
-	if filename == 'README.md':
-		# for README.md files, hide the table of contents
-		out.write('<style>#embedded_nav {width:0;height:0;padding:0;overflow:hidden;} #rightnav {width:0;height:0;padding:0;}</style>')
-	out.write(footer)
-	nav.close()
+	if struct != None:
+		title = '<a href="' + value.link + '">' + title + '</a>'
+	source = '<div class="source">[<a href="' + get_file_link(sundered) + '" target="_blank">view source</a>]</div>' if filename != 'README.md' else ''
+
+	out, nav = StringIO(), StringIO()
+	if struct != None:
+		generate_member_list(out, nav, [struct], page=key)
+	else:
+		if value.description != None:
+			out.write(to_html(value.description))
+
+		# generate the summary table
+		if filename != 'README.md':
+			generate_member_table(out, None, nav, value.objects, 'Classes, functions, and variables in this file')
+
+		# generate detailed entries for each object in the file
+		generate_member_list(out, nav, value.objects)
+
+	# for README.md files, hide the table of contents
+	style = '<style>#embedded_nav {width:0;height:0;padding:0;overflow:hidden;} #rightnav {width:0;height:0;padding:0;}</style>' if filename == 'README.md' else ''
+	# MathJax is only loaded by the pages with formulas that weren't prerendered
+	contents = out.getvalue()
+	page_footer = markup['footer'].render(mathjax=(markup['mathjax'].text if unrendered_formula.search(contents) else ''))
+	page = markup['page'].render(header=page_header, menu_attributes=menu_attributes, search=get_search_box(), nav=left_nav, title=title,
+		source=source, contents=contents, toc=nav.getvalue(), style=style, footer=page_footer)
+	if relative_urls:
+		page = make_relative(page, filepath)
 	out.close()
+	nav.close()
 
-copyfile(style_file, os.path.sep.join(['Docs','html', style_file]))
-copyfile(script_file, os.path.sep.join(['Docs','html', script_file]))
-copyfile(hamburger_file, os.path.sep.join(['Docs','html', hamburger_file]))
-copyfile('critical.css', os.path.sep.join(['Docs','html', 'critical.css']))
+	# every object is only rendered on its own page, so the cached renderings (and reloaded subtrees) are no longer needed
+	render_cache.clear()
+	loaded_subtrees.clear()
+	stats.cache_hits = render_cache.hits - hits
+	stats.cache_misses = render_cache.misses - misses
+	stats.render_time = time.perf_counter() - start
+	stats.render_peak = get_peak_memory()
+
+	reset_peak_memory()
+	start = time.perf_counter()
+	if minify:
+		page = minify_html(page)
+	stats.written = write_output(filepath, page.encode('utf-8'))
+	stats.write_time = time.perf_counter() - start
+	stats.write_peak = get_peak_memory()
+	return stats
+
+def get_elements(obj):
+	# returns the Doxygen XML subtrees that are rendered for the given object
+	if isinstance(obj, Class):
+		elements = [obj.description]
+		for member in obj.objects:
+			elements.extend(get_elements(member))
+		return elements
+	elif isinstance(obj, Function):
+		return [obj.description, obj.type] + [arg.type for arg in obj.args]
+	elif isinstance(obj, Typedef):
+		return [obj.description, obj.type, obj.args]
+	return [obj.description, obj.type]
+
+def get_compound_hash(ref):
+	if ref not in compound_hashes:
+		compound_hashes[ref] = md5_hash(get_xml_path(ref))
+	return compound_hashes[ref]
+
+packed_ref = re.compile(b'<ref [^>]*?refid="([^"]*)"')
+
+def get_refids(element):
+	# returns the refid of each `ref` in the given subtree
+	if isinstance(element, LazyElement):
+		return element.refids
+	if isinstance(element, PackedElement):
+		# the serialized subtree doesn't need to be parsed
+		return [html.unescape(match.group(1).decode('utf-8')) for match in packed_ref.finditer(element.data)]
+	return [ref.attrib['refid'] for ref in element.iter('ref')]
+
+packed_formula = re.compile(b'<formula[^>]*>(.*?)</formula>', re.S)
+
+def get_formulas(element):
+	# returns the text of each `formula` in the given subtree
+	if isinstance(element, LazyElement):
+		return element.formulas
+	if isinstance(element, PackedElement):
+		return [html.unescape(match.group(1).decode('utf-8')) for match in packed_formula.finditer(element.data)]
+	return [formula.text for formula in element.iter('formula') if formula.text != None]
+
+def get_page_elements(value, struct=None):
+	# returns the Doxygen XML subtrees that are rendered on the page of the given file, or of one of its structs
+	if struct != None:
+		return get_elements(struct)
+	elements = [value.description]
+	for obj in value.objects:
+		if not is_split(obj):
+			elements.extend(get_elements(obj))
+	return elements
+
+def get_page_inputs(value, template_hash, nav_hash, struct=None):
+	# collect the cross-references on this page (of the given file, or of one of its structs), along with where they currently point to
+	xrefs = {}
+	for element in get_page_elements(value, struct):
+		if element == None:
+			continue
+		for ref in get_refids(element):
+			xrefs[ref] = get_ref_link(ref)
+	return {
+		'templates': template_hash,
+		'nav': nav_hash,
+		'compounds': {ref : get_compound_hash(ref) for ref in value.compounds},
+		'xrefs': xrefs
+	}
+
+def get_formula_renderer_id():
+	# returns what identifies `formula_renderer` in the formula cache: the command, or the `renderer_id` attribute of
+	# the function, or otherwise its qualified name (lambdas and nested functions don't have a unique one)
+	if isinstance(formula_renderer, str):
+		return formula_renderer
+	if getattr(formula_renderer, 'renderer_id', None) != None:
+		return str(formula_renderer.renderer_id)
+	name = getattr(formula_renderer, '__qualname__', None)
+	if name == None or '<' in name:
+		raise ValueError('The formula renderer {!r} has no unique name, so it needs a `renderer_id` attribute.'.format(formula_renderer))
+	return formula_renderer.__module__ + '.' + name
+
+def get_formula_cache_file(formula):
+	return os.path.join(formula_cache_dir, md5_string(get_formula_renderer_id() + '\n' + formula) + '.html')
+
+def run_formula_renderer(command, texts):
+	# runs the given command, which reads a JSON list of formulas (with their TeX delimiters, e.g. '$x^2$' or
+	# '\\[x^2\\]') from its standard input, and writes a JSON list of their HTML (e.g. SVG images), or null for each
+	# formula that it couldn't render, to its standard output
+	result = subprocess.run(shlex.split(command), input=json.dumps(texts).encode('utf-8'), stdout=subprocess.PIPE, check=True)
+	return json.loads(result.stdout.decode('utf-8'))
+
+def prerender_formulas(texts):
+	# adds the HTML of the given formulas to `formulas`; each formula is read from the formula cache if possible,
+	# and otherwise rendered by `formula_renderer`, which is either a command (see `run_formula_renderer`) or a
+	# function that takes a list of formulas and returns a list of the same form; all of the formulas that aren't
+	# cached are rendered at once, so that the renderer only starts once per build
+	missing = []
+	for text in sorted(set(texts)):
+		if text in formulas:
+			continue
+		try:
+			with open(get_formula_cache_file(text), 'rb') as f:
+				formulas[text] = f.read().decode('utf-8')
+		except OSError:
+			missing.append(text)
+	if len(missing) == 0:
+		return
+	rendered = run_formula_renderer(formula_renderer, missing) if isinstance(formula_renderer, str) else formula_renderer(missing)
+	if len(rendered) != len(missing):
+		raise RuntimeError('The formula renderer returned {} results for {} formulas.'.format(len(rendered), len(missing)))
+	for text, formula in zip(missing, rendered):
+		# the formulas that couldn't be rendered are typeset by MathJax in the browser (and retried in the next build)
+		if formula != None:
+			formulas[text] = formula
+			write_file(get_formula_cache_file(text), formula.encode('utf-8'))
+
+def get_search_box():
+	if not search_index:
+		return ''
+	return '<div id="search"><input id="search_box" type="search" placeholder="Search" autocomplete="off" data-index="' + url_root + 'search/index.json"><ul id="search_results"></ul></div>'
+
+search_shard_size = 1000	# the maximum number of symbols in each shard of the search index (unless they all have the same name)
+
+def get_symbol_kind(obj):
+	# returns the kind of the given object in the search index and in the symbol export
+	if isinstance(obj, Class):
+		return 'struct'
+	elif isinstance(obj, Function):
+		return 'function'
+	elif isinstance(obj, Variable):
+		return 'define' if obj.type == None else 'variable'
+	return 'typedef'
+
+def get_search_entries(members, entries, name_prefix=''):
+	# appends the search entry of each visible object (and of each visible member of each class) to `entries`
+	for obj in members:
+		if not obj.visible:
+			continue
+		name = obj.name_text if isinstance(obj, (Class, Function)) else obj.name
+		entries.append((name.lower(), name, name_prefix, get_symbol_kind(obj), obj.signature, obj.page, obj.link))
+		if isinstance(obj, Class):
+			get_search_entries(obj.objects, entries, name_prefix + obj.name_text + '::')
+
+def shard_search_entries(entries, shards, prefix_length=1):
+	# partitions the given entries by the prefixes of their (lowercase) names, splitting the large partitions by longer prefixes
+	partitions = {}
+	for entry in entries:
+		partitions.setdefault(entry[0][:prefix_length], []).append(entry)
+	for prefix, partition in partitions.items():
+		if len(partition) > search_shard_size and any(len(entry[0]) > prefix_length for entry in partition):
+			shard_search_entries(partition, shards, prefix_length + 1)
+		else:
+			shards[prefix] = partition
+
+def get_all_search_entries(files):
+	entries = []
+	for key, value in files.items():
+		get_search_entries(value.objects, entries)
+	return entries
+
+def write_search_index(entries):
+	# writes the search index into 'search/', and returns the paths of its files; 'index.json' maps the name prefix of each shard to its file, and each
+	# shard lists the symbols whose names start with that prefix, sorted by their lowercase name
+	entries.sort()
+	shards = {}
+	shard_search_entries(entries, shards)
+
+	directory = os.path.join(html_dir, 'search')
+	outputs = []
+	index = {}
+	for i, prefix in enumerate(sorted(shards)):
+		paths = sorted(set(entry[5] for entry in shards[prefix]))
+		path_ids = {path : j for j, path in enumerate(paths)}
+		# each symbol is a list of its name, qualifier, kind, signature, file (an index into 'files'), and anchor
+		symbols = [[name, qualifier, kind, signature, path_ids[path], link] for key, name, qualifier, kind, signature, path, link in shards[prefix]]
+		data = json.dumps({'files' : paths, 'symbols' : symbols}, separators=(',', ':'))
+		filename = str(i) + '.json'
+		write_output(os.path.join(directory, filename), data.encode('utf-8'))
+		outputs.extend(get_output_files(os.path.join(directory, filename)))
+		index[prefix] = filename + '?' + md5_string(data)
+	# (a relative root is relative to the index, rather than to the page)
+	root = get_relative_root(os.path.join(directory, 'index.json')) if relative_urls else url_root
+	write_output(os.path.join(directory, 'index.json'), json.dumps({'root' : root, 'shards' : index}, separators=(',', ':')).encode('utf-8'))
+	outputs.extend(get_output_files(os.path.join(directory, 'index.json')))
+
+	# remove the shards of previous builds (other shards of the project may be writing the index concurrently, see
+	# `build_repositories`, so their temporary files are kept)
+	for filename in os.listdir(directory):
+		if os.path.join(directory, filename) not in outputs and '.tmp' not in filename:
+			with contextlib.suppress(FileNotFoundError):
+				os.remove(os.path.join(directory, filename))
+	return outputs
+
+def add_symbol_records(members, records, refids, parent, name_prefix=''):
+	# appends the record of each of the given objects (and of the members of each struct) to `records`
+	for obj in members:
+		name = obj.name_text if isinstance(obj, (Class, Function)) else obj.name
+		templates = obj.templates if isinstance(obj, (Class, Function)) else []
+		args = obj.args if isinstance(obj, Function) else []
+		# (the structs in files are qualified by their namespace, and their members by the qualified name of the struct)
+		qualifier = obj.namespace + '::' if isinstance(obj, Class) and name_prefix == '' and obj.namespace else name_prefix
+		record = {
+			'id' : len(records) + 1,
+			'refid' : refids.get(id(obj)),
+			'kind' : get_symbol_kind(obj),
+			'name' : name,
+			'qualified_name' : qualifier + name,
+			'parent' : parent,
+			'file' : obj.location.path,
+			'line' : obj.location.start,
+			'end_line' : obj.location.end,
+			'documented' : obj.visible,
+			'signature' : obj.signature if obj.signature != None else get_signature(obj, name_prefix),
+			'type' : to_text(obj.type) if not isinstance(obj, Class) and obj.type != None else None,
+			'url' : obj.url,
+			'source_url' : get_source_link(obj.location),
+			'templates' : [{'type' : template.type, 'default_value' : template.default_value} for template in templates],
+			'params' : [{'type' : to_text(arg.type), 'name' : arg.name_text, 'default_value' : arg.default_value} for arg in args]
+		}
+		records.append(record)
+		if isinstance(obj, Class):
+			add_symbol_records(obj.objects, records, refids, record['id'], qualifier + name + '::')
+
+def get_symbol_records(files):
+	# returns a record of each file and of each object in the parsed model; each record has an `id`, and the records
+	# of the objects in each file and struct refer to it by its `id` in their `parent` field
+	refids = {id(obj) : ref for ref, obj in refs.items()}
+	records = []
+	for key in sorted(files):
+		value = files[key]
+		filepath = get_output_path(key, value)
+		record = {
+			'id' : len(records) + 1,
+			'refid' : refids.get(id(value)),
+			'kind' : 'file',
+			'name' : os.path.split(key)[1],
+			'qualified_name' : key,
+			'parent' : None,
+			'file' : key,
+			'line' : None,
+			'end_line' : None,
+			'documented' : value.visible,
+			'signature' : None,
+			'type' : None,
+			'url' : url_root + os.path.relpath(filepath, html_dir).replace(os.path.sep, '/') if filepath != None else None,
+			'source_url' : get_file_link(os_path_sunder(key)),
+			'templates' : [],
+			'params' : []
+		}
+		records.append(record)
+		add_symbol_records(value.objects, records, refids, record['id'])
+	render_cache.clear()
+	return records
+
+symbol_columns = ('id', 'refid', 'kind', 'name', 'qualified_name', 'parent', 'file', 'line', 'end_line', 'documented', 'signature', 'type', 'url', 'source_url')
+
+symbol_schema = '''
+CREATE TABLE symbols (id INTEGER PRIMARY KEY, refid TEXT, kind TEXT NOT NULL, name TEXT NOT NULL, qualified_name TEXT NOT NULL,
+	parent INTEGER REFERENCES symbols(id), file TEXT NOT NULL, line INTEGER, end_line INTEGER, documented INTEGER NOT NULL,
+	signature TEXT, type TEXT, url TEXT, source_url TEXT);
+CREATE TABLE params (symbol INTEGER NOT NULL REFERENCES symbols(id), kind TEXT NOT NULL, position INTEGER NOT NULL,
+	type TEXT, name TEXT, default_value TEXT, PRIMARY KEY (symbol, kind, position));
+CREATE INDEX symbols_refid ON symbols(refid);
+CREATE INDEX symbols_name ON symbols(name);
+CREATE INDEX symbols_qualified_name ON symbols(qualified_name);
+CREATE INDEX symbols_parent ON symbols(parent);
+CREATE INDEX symbols_file ON symbols(file);
+'''
+
+def write_symbol_database(filepath, records):
+	# the 'params' table has a row for each template parameter (of kind 'template') and function parameter (of
+	# kind 'param') of each symbol; the database is built in a temporary file, so readers never see a partial one
+	os.makedirs(os.path.dirname(filepath), exist_ok=True)
+	temp_filepath = filepath + '.tmp' + str(os.getpid())
+	if os.path.exists(temp_filepath):
+		os.remove(temp_filepath)
+	try:
+		connection = sqlite3.connect(temp_filepath)
+		try:
+			connection.executescript(symbol_schema)
+			connection.executemany('INSERT INTO symbols VALUES (' + ', '.join(['?'] * len(symbol_columns)) + ')',
+				[tuple(record[column] for column in symbol_columns) for record in records])
+			params = []
+			for record in records:
+				for kind in ('templates', 'params'):
+					for position, param in enumerate(record[kind]):
+						params.append((record['id'], kind[:-1], position, param.get('type'), param.get('name'), param['default_value']))
+			connection.executemany('INSERT INTO params VALUES (?, ?, ?, ?, ?, ?)', params)
+			connection.commit()
+		finally:
+			connection.close()
+		os.replace(temp_filepath, filepath)
+	finally:
+		# (the temporary database only remains if writing or renaming it failed)
+		if os.path.exists(temp_filepath):
+			os.remove(temp_filepath)
+
+def write_symbols(filepath, files):
+	# exports the parsed model for other tools (e.g. IDE integrations and link checkers), see `get_symbol_records`
+	filepath = os.path.abspath(filepath)
+	records = get_symbol_records(files)
+	if os.path.splitext(filepath)[1] in ('.db', '.sqlite', '.sqlite3'):
+		write_symbol_database(filepath, records)
+	else:
+		write_file(filepath, ''.join(json.dumps(record, sort_keys=True) + '\n' for record in records).encode('utf-8'))
+
+def get_registry_file(name):
+	return os.path.join(registry_dir, name + '.json')
+
+def write_registry(files, symbols):
+	# writes the registry of this shard: the URL of each refid, the pages (and whether each is visible), and the
+	# entries of the search index
+	registry = {
+		'refs' : {ref : get_ref_link(ref) for ref in refs if get_ref_link(ref) != None},
+		'pages' : [[key, value.visible] for key, value in files.items()] + [[key, True] for key in struct_pages],
+		'symbols' : symbols
+	}
+	write_output(get_registry_file(shard), json.dumps(registry, sort_keys=True, separators=(',', ':')).encode('utf-8'))
+
+def read_registries():
+	# returns the registries of the other shards (only of those in `shards`, if it is set)
+	registries = []
+	try:
+		filenames = sorted(os.listdir(registry_dir))
+	except OSError:
+		return registries
+	for filename in filenames:
+		if filename.endswith('.json') and filename != shard + '.json' and (shards == None or filename[:-len('.json')] in shards):
+			with open(os.path.join(registry_dir, filename), 'r') as f:
+				registries.append(json.load(f))
+	return registries
+
+def read_manifest():
+	try:
+		with open(manifest_file, 'r') as f:
+			return json.load(f)['pages']
+	except (OSError, ValueError, KeyError):
+		return {}
+
+def write_manifest(pages):
+	# (written atomically, since a truncated manifest would break the next incremental build)
+	write_file(manifest_file, json.dumps({'pages': pages}, sort_keys=True).encode('utf-8'))
+
+def compress_data(data, format):
+	if format == 'gz':
+		# the timestamp is omitted so that the output is the same for the same data
+		return gzip.compress(data, 9, mtime=0)
+	elif format == 'br':
+		if brotli == None:
+			raise ValueError('Brotli compression was requested, but brotli is not installed.')
+		return brotli.compress(data)
+	raise ValueError('Unrecognized compression format "{}".'.format(format))
+
+def get_output_files(filepath):
+	# returns the paths of the given output file and of its compressed copies
+	return [filepath] + [filepath + '.' + format for format in compress]
+
+def write_file(filepath, data):
+	# writes the file atomically (so a crash never leaves a partial file), unless it already contains `data`;
+	# returns whether the file was written
+	try:
+		if os.path.getsize(filepath) == len(data):
+			with open(filepath, 'rb') as f:
+				if f.read() == data:
+					return False
+	except OSError:
+		pass
+	os.makedirs(os.path.dirname(filepath), exist_ok=True)
+	temp_filepath = filepath + '.tmp' + str(os.getpid())
+	try:
+		with open(temp_filepath, 'wb') as f:
+			f.write(data)
+		os.replace(temp_filepath, filepath)
+	finally:
+		# (the temporary file only remains if the write or the rename failed)
+		if os.path.exists(temp_filepath):
+			os.remove(temp_filepath)
+	return True
+
+def write_output(filepath, data):
+	# writes the output file, along with its compressed copies; unchanged files are not rewritten, so that their
+	# modification times only change when their contents do
+	written = write_file(filepath, data)
+	for format in compress:
+		if written or not os.path.isfile(filepath + '.' + format):
+			write_file(filepath + '.' + format, compress_data(data, format))
+	return written
+
+def remove_page(filepath):
+	for output_file in get_output_files(filepath):
+		try:
+			os.remove(output_file)
+		except OSError:
+			pass
+	try:
+		os.removedirs(os.path.dirname(filepath))
+	except OSError:
+		pass
+
+# the files in the output directory that are inputs rather than outputs, i.e. that are written by the gulp build (see
+# 'gulpfile.js') or added by hand, and read by `inline_stylesheets` or by the gulp build; they are never removed
+source_files = ('compiled_*.css', 'lib/*.js', '*.pdf', '*.py', '*.[jJ][pP][gG]', '*.[jJ][pP][eE][gG]', '*.[pP][nN][gG]', '*.[gG][iI][fF]', '*.[wW][eE][bB][pP]', '*.[tT][iI][fF]')
+
+def remove_stale_outputs(outputs, directory):
+	# removes the files in `directory` that are not in `outputs` (i.e. left over from previous builds), except for
+	# the `source_files`
+	outputs = set(os.path.normpath(filepath) for filepath in outputs)
+	for dirpath, dirnames, filenames in os.walk(directory, topdown=False):
+		for filename in filenames:
+			filepath = os.path.join(dirpath, filename)
+			relative_path = os.path.relpath(filepath, html_dir).replace(os.path.sep, '/')
+			if os.path.normpath(filepath) not in outputs and not any(fnmatchcase(relative_path, pattern) for pattern in source_files):
+				os.remove(filepath)
+		if dirpath != directory and len(os.listdir(dirpath)) == 0:
+			os.rmdir(dirpath)
+
+def generate_pages(pages, jobs):
+	# returns the `PageStats` of each generated page
+	# (the workers inherit the parsed model (`files`, `refs`, `root`, etc) by forking, so it is only parsed once)
+	return map_forked(generate_page, pages, jobs, ordered=False)
+
+preserved_elements = re.compile(r'<(pre|textarea|script|style)\b.*?</\1\s*>', re.S | re.I)
+block_tags = 'html|head|body|title|meta|link|div|nav|ul|ol|li|table|thead|tbody|tr|td|th|p|h[1-6]|br|hr|noscript|script|style'
+# (only ASCII whitespace is collapsed, as in HTML and CSS; e.g. non-breaking spaces are significant)
+whitespace = re.compile(r'[ \t\n\r\f]+')
+whitespace_before_block = re.compile(r'[ \t\n\r\f]+(?=</?(?:' + block_tags + r')\b)', re.I)
+whitespace_after_block = re.compile(r'(</?(?:' + block_tags + r')\b[^>]*>)[ \t\n\r\f]+', re.I)
+
+def collapse_whitespace(html):
+	html = whitespace.sub(' ', html)
+	html = whitespace_before_block.sub('', html)
+	return whitespace_after_block.sub(r'\1', html)
+
+def minify_html(html):
+	# collapses the whitespace in the given HTML, except in the elements where it is significant (e.g. the code
+	# blocks) and in scripts and styles; whitespace next to block-level tags is removed entirely
+	out, last = [], 0
+	for match in preserved_elements.finditer(html):
+		out.append(collapse_whitespace(html[last:match.start()]))
+		out.append(match.group(0))
+		last = match.end()
+	out.append(collapse_whitespace(html[last:]))
+	return ''.join(out)
+
+css_literal = r'''"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'|url\([^)'"]*\)'''	# the strings and unquoted URLs
+css_literals = re.compile(css_literal, re.S | re.I)
+css_comment = re.compile(r'(' + css_literal + r')|/\*.*?\*/', re.S | re.I)	# (skips the literals, which may contain '/*')
+css_whitespace = re.compile(r'[ \t\n\r\f]*([{};,])[ \t\n\r\f]*')
+
+def collapse_css_whitespace(css):
+	css = whitespace.sub(' ', css)
+	return css_whitespace.sub(r'\1', css).replace(';}', '}')
+
+def minify_css(css):
+	# removes the comments and the insignificant whitespace, except in the strings and URLs
+	css = css_comment.sub(r'\1', css)
+	out, last = [], 0
+	for match in css_literals.finditer(css):
+		out.append(collapse_css_whitespace(css[last:match.start()]))
+		out.append(match.group(0))
+		last = match.end()
+	out.append(collapse_css_whitespace(css[last:]))
+	return ''.join(out).strip()
+
+inline_link = re.compile(r'<link\b[^>]*\bhref="([^"]*)"[^>]*\binline\b[^>]*>')
+
+def inline_stylesheets(template):
+	# replaces the stylesheet links marked `inline` with the contents of the stylesheets, which are looked up
+	# relative to the output directory (as the gulp build does); the gulp build compiles 'critical.css' into
+	# 'compiled_critical.css', so if it hasn't, the uncompiled stylesheet is inlined instead
+	def get_style(match):
+		href = match.group(1)
+		filepath = os.path.join(html_dir, href)
+		if not os.path.isfile(filepath) and os.path.basename(href) == 'compiled_' + os.path.basename(critical_file):
+			filepath = critical_file
+		with open(filepath, 'r') as f:
+			return '<style>' + minify_css(f.read()) + '</style>'
+	return inline_link.sub(get_style, template)
+
+def read_assets():
+	# returns the filename and the contents of each asset in the output directory; if `hashed_assets` is set, the
+	# filenames of the assets that the pages link to contain the hash of their contents, so that they can be cached
+	# indefinitely
+	assets = {}
+	for asset_file in [style_file, script_file, hamburger_file, critical_file]:
+		with open(asset_file, 'rb') as f:
+			data = f.read()
+		if minify and asset_file.endswith('.css'):
+			data = minify_css(data.decode('utf-8')).encode('utf-8')
+		filename = os.path.basename(asset_file)
+		if hashed_assets and asset_file != critical_file:
+			# (the critical stylesheet is inlined rather than linked, see `inline_stylesheets`)
+			root, extension = os.path.splitext(filename)
+			filename = root + '.' + hashlib.md5(data).hexdigest() + extension
+		assets[asset_file] = (filename, data)
+	return assets
+
+def read_templates():
+	# returns the header and footer, with the URLs of the assets filled in
+	if hashed_assets:
+		assets = read_assets()
+		style_url, script_url, hamburger_url = [url_root + assets[asset_file][0] for asset_file in [style_file, script_file, hamburger_file]]
+	else:
+		style_url = url_root + os.path.basename(style_file) + '?' + md5_hash(style_file)
+		script_url = url_root + os.path.basename(script_file) + '?' + md5_hash(script_file)
+		hamburger_url = url_root + os.path.basename(hamburger_file) + '?' + md5_hash(hamburger_file)
+	with open(header_file, 'r') as f:
+		header = f.read()
+		header = header.replace('$style_file', style_url)
+		header = header.replace('$hamburger_file', hamburger_url)
+	with open(footer_file, 'r') as f:
+		footer = f.read()
+		footer = footer.replace('$script_file', script_url)
+		footer = footer.replace('$style_file', style_url)
+	if minify:
+		header, footer = inline_stylesheets(header), inline_stylesheets(footer)
+	return header, footer
+
+def read_markup(header, footer):
+	# returns the compiled templates of the pages, along with the header and footer
+	compiled = {'header' : Template(header, ('title', 'navbar_title')), 'footer' : Template(footer, ('mathjax',))}
+	for name, text in default_markup.items():
+		slots = re.findall(r'\$(\w+)', text)
+		filepath = os.path.join(template_dir, name + '.html') if template_dir != None else None
+		if filepath != None and os.path.isfile(filepath):
+			with open(filepath, 'r') as f:
+				text = f.read().rstrip('\r\n')
+		compiled[name] = Template(text, slots)
+	return compiled
+
+def copy_assets():
+	# returns the paths of the copied files
+	outputs, filenames = [], {}
+	for asset_file, (filename, data) in read_assets().items():
+		filepath = os.path.join(html_dir, filename)
+		write_output(filepath, data)
+		outputs.extend(get_output_files(filepath))
+		filenames[os.path.basename(asset_file)] = filename
+	if hashed_assets:
+		# the asset manifest maps the name of each asset to its filename, for servers and deployment scripts
+		filepath = os.path.join(html_dir, 'assets.json')
+		write_output(filepath, json.dumps(filenames, sort_keys=True, indent='\t').encode('utf-8'))
+		outputs.extend(get_output_files(filepath))
+	return outputs
+
+class BuildSummary:
+	__slots__ = ('pages', 'unchanged', 'removed', 'page_stats')
+
+	def __init__(self, pages, unchanged, removed, page_stats):
+		self.pages = pages	# the keys of the generated pages
+		self.unchanged = unchanged	# the number of pages that were up to date
+		self.removed = removed	# the output paths of the removed pages
+		self.page_stats = page_stats
+
+# the module-level settings as they were before any builder was activated
+default_settings = {name : globals()[name] for name in settings}
+
+class DocBuilder:
+	# builds the documentation of a single project; the parsed model is kept between builds, so several projects
+	# can be built (and rebuilt) in one process, e.g.:
+	#   builder = DocBuilder(xml_dir='proj/Docs/xml', html_dir='proj/Docs/html', url_root='/docs/')
+	#   builder.parse()
+	#   builder.render()
+	def __init__(self, **kwargs):
+		# the keyword arguments override the module-level settings (see `settings`)
+		self.settings = dict(default_settings)
+		for name, value in kwargs.items():
+			if name not in self.settings:
+				raise TypeError('Unrecognized setting "{}".'.format(name))
+			self.settings[name] = value
+		if self.settings['shard'] != None and 'manifest_file' not in kwargs:
+			# each shard has its own manifest
+			self.settings['manifest_file'] = os.path.splitext(self.settings['manifest_file'])[0] + '.' + self.settings['shard'] + '.json'
+		self.registry_refs = {}
+		self.refs = {}
+		self.struct_pages = {}	# the file and struct of the page of each struct that was split from its file (see `split_file`)
+		self.compound_hashes = {}
+		self.parsed = {}	# the `ParsedCompound` of each compound, which is reused until its XML file changes
+		self.stamps = {}	# the modification time and size of the XML file of each parsed compound
+		self.files = None
+		self.root = None
+		self.header = None
+		self.footer = None
+		self.markup = {}
+		self.formulas = {}	# the prerendered formulas, which are kept between builds
+		self.nav_hash = None
+
+	def activate(self):
+		# the functions in this module read the settings and the parsed model from module globals (which is also how
+		# the worker processes inherit them), so they are swapped in before each step
+		globals().update(self.settings)
+		# (the module-level defaults of these are declared along with the settings)
+		globals().update(refs=self.refs, registry_refs=self.registry_refs, compound_hashes=self.compound_hashes, files=self.files, struct_pages=self.struct_pages, root=self.root,
+			markup=self.markup, formulas=self.formulas, nav_hash=self.nav_hash)
+		set_xml_backend(self.settings['xml_backend'])
+		render_cache.clear()
+
+	def parse(self, jobs=1):
+		# (re)parses the Doxygen XML output (using `jobs` worker processes), and computes the links of every object;
+		# only the compounds whose XML files changed since the last call are re-parsed
+		self.refs = {}
+		self.files = {}
+		self.struct_pages = {}
+		self.activate()
+		with profiler.phase('index parse'):
+			compounds = read_index()
+			stamps = {}
+			for kind in compounds:
+				for ref, name in compounds[kind]:
+					stamps[ref] = get_file_stamp(get_xml_path(ref))
+			for ref in list(self.parsed):
+				if stamps.get(ref) != self.stamps[ref]:
+					del self.parsed[ref]
+					self.compound_hashes.pop(ref, None)
+			self.stamps = stamps
+		with profiler.phase('compound parse'):
+			parse_compounds(compounds, self.files, self.parsed, shard, jobs)
+			if cache_dir != None:
+				evict_cache()
+			if shard != None:
+				# drop the objects of other repositories (from namespaces that span repositories)
+				self.files = {key : value for key, value in self.files.items() if os_path_sunder(key)[0] == shard}
+				shard_files = set(id(value) for value in self.files.values())
+				self.refs = {ref : obj for ref, obj in self.refs.items() if id(obj) in shard_files or (not isinstance(obj, File) and os_path_sunder(obj.location.path)[0] == shard)}
+				self.activate()
+
+		# sort objects in each file by line number
+		with profiler.phase('link computation'):
+			for key, value in self.files.items():
+				value.objects.sort(key=lambda obj : obj.location.start)
+				value.visible = index_objects(value.objects)
+				value.link = url_root + key + '.html'
+				split_file(key, value, self.struct_pages)
+
+	def export_symbols(self, filepath=None):
+		# writes the parsed model to the given file (by default, the `symbols_file` setting), see `write_symbols`
+		if self.files == None:
+			raise RuntimeError('The project must be parsed before its symbols are exported.')
+		self.activate()
+		with profiler.phase('symbol export'):
+			write_symbols(filepath if filepath != None else symbols_file, self.files)
+
+	def export_registry(self):
+		# writes the registry of this shard, so that the other shards can link to it
+		if self.files == None:
+			raise RuntimeError('The project must be parsed before its registry is exported.')
+		self.activate()
+		write_registry(self.files, get_all_search_entries(self.files))
+
+	def render(self, incremental=False, jobs=1):
+		# writes the HTML pages of the parsed model, and returns a `BuildSummary`; if `incremental` is True, only
+		# the pages whose inputs changed since the last build (according to the build manifest) are regenerated
+		if self.files == None:
+			raise RuntimeError('The project must be parsed before it is rendered.')
+		self.activate()
+		# the output directory isn't cleared for full builds, so that unchanged files keep their modification times
+		manifest = read_manifest()
+		self.header, self.footer = read_templates()
+		self.markup = read_markup(self.header, self.footer)
+		outputs = []
+
+		# construct the path tree structure (along with the pages of the other shards, which are also in the navigation tree)
+		registries = read_registries() if shard != None else []
+		self.registry_refs = {}
+		self.root = Path(False, None)
+		for registry in registries:
+			self.registry_refs.update(registry['refs'])
+			for key, visible in registry['pages']:
+				self.root.add(os_path_sunder(key), key, visible)
+		for key, value in self.files.items():
+			self.root.add(os_path_sunder(key), key, value.visible)
+		for key in self.struct_pages:
+			self.root.add(os_path_sunder(key), key, True)
+		self.activate()
+
+		with profiler.phase('change detection'):
+			# render the left navigation tree (this also caches the rendered entries for every page)
+			nav = StringIO()
+			generate_left_nav(nav, self.root, None)
+			nav_html = nav.getvalue()
+			self.nav_hash = md5_string(nav_html)
+			nav.close()
+			if shared_nav:
+				if relative_urls:
+					# (the script resolves the relative links relative to 'nav.html')
+					nav_html = make_relative(nav_html, os.path.join(html_dir, 'nav.html'))
+				write_output(os.path.join(html_dir, 'nav.html'), (minify_html(nav_html) if minify else nav_html).encode('utf-8'))
+				outputs.extend(get_output_files(os.path.join(html_dir, 'nav.html')))
+			else:
+				remove_page(os.path.join(html_dir, 'nav.html'))
+
+			# determine which pages need to be (re)generated
+			# (the layout of the pages also depends on whether the navigation tree is shared, and on the search box, and
+			# the compressed copies of the pages are only written when they are regenerated)
+			template_hash = md5_string(generator_hash + ''.join(self.markup[name].text for name in sorted(self.markup)) + self.footer + str(shared_nav) + str(search_index) + str(max_page_symbols) + str(max_table_rows) + str(relative_urls) + str(minify) + str(compress) + (get_formula_renderer_id() if formula_renderer != None else ''))
+			pages, new_manifest = [], {}
+			for key, value in self.files.items():
+				filepath = get_output_path(key, value)
+				if filepath == None:
+					continue
+				new_manifest[filepath] = get_page_inputs(value, template_hash, self.nav_hash)
+				outputs.extend(get_output_files(filepath))
+				if not incremental or manifest.get(filepath) != new_manifest[filepath] or not os.path.isfile(filepath):
+					pages.append(key)
+			for key, (file_key, struct) in struct_pages.items():
+				filepath = get_output_path(key, self.files[file_key])
+				new_manifest[filepath] = get_page_inputs(self.files[file_key], template_hash, self.nav_hash, struct)
+				outputs.extend(get_output_files(filepath))
+				if not incremental or manifest.get(filepath) != new_manifest[filepath] or not os.path.isfile(filepath):
+					pages.append(key)
+
+		if formula_renderer != None:
+			with profiler.phase('formula prerendering'):
+				texts = []
+				for key in pages:
+					file_key, struct = struct_pages.get(key, (key, None))
+					for element in get_page_elements(self.files[file_key], struct):
+						if element != None:
+							texts.extend(get_formulas(element))
+				prerender_formulas(texts)
+
+		# generate html output (the pages read the templates and the navigation hash from module globals)
+		self.activate()
+		with profiler.phase('render + write'):
+			page_stats = generate_pages(pages, jobs)
+			stale = [filepath for filepath in manifest if filepath not in new_manifest]
+			for filepath in stale:
+				remove_page(filepath)
+			write_manifest(new_manifest)
+
+		if search_index:
+			with profiler.phase('search index'):
+				entries = get_all_search_entries(self.files)
+				for registry in registries:
+					entries.extend(tuple(entry) for entry in registry['symbols'])
+				outputs.extend(write_search_index(entries))
+		else:
+			rmtree(os.path.join(html_dir, 'search'), True)
+
+		with profiler.phase('asset copy'):
+			outputs.extend(copy_assets())
+		if not incremental:
+			remove_stale_outputs(outputs, html_dir if shard == None else os.path.join(html_dir, shard))
+		return BuildSummary(pages, len(new_manifest) - len(pages), stale, page_stats)
+
+	def build(self, incremental=False, jobs=1):
+		self.parse(jobs)
+		if self.settings['shard'] != None:
+			self.export_registry()
+		if self.settings['symbols_file'] != None:
+			self.export_symbols()
+		return self.render(incremental, jobs)
+
+	def get_watched_files(self):
+		# returns the modification time and size of each input of the build
+		stamps = {}
+		xml_dir = self.settings['xml_dir']
+		for filename in os.listdir(xml_dir):
+			if filename.endswith('.xml'):
+				stamps[filename] = get_file_stamp(os.path.join(xml_dir, filename))
+		for name in ['header_file', 'footer_file', 'style_file', 'script_file', 'hamburger_file', 'critical_file']:
+			stamps[name] = get_file_stamp(self.settings[name])
+		# (the overrides that don't exist yet are watched too, so that newly added templates are picked up)
+		if self.settings['template_dir'] != None:
+			for name in default_markup:
+				stamps[name + '.html'] = get_file_stamp(os.path.join(self.settings['template_dir'], name + '.html'))
+		return stamps
+
+	def watch(self, port=8000, interval=0.5, jobs=1, bind='127.0.0.1'):
+		# serves the documentation on the given port (only to this machine, unless `bind` is another address), and whenever the XML output, the templates, or the assets
+		# change, re-parses the changed compounds, regenerates the affected pages, and reloads the open pages
+		live_reload = LiveReload()
+		server = http.server.ThreadingHTTPServer((bind, port), get_request_handler(self.settings['html_dir'], live_reload))
+		server.daemon_threads = True
+		threading.Thread(target=server.serve_forever, daemon=True).start()
+		host = 'localhost' if bind in ('', '0.0.0.0', '127.0.0.1') else bind
+		print('Serving the documentation at http://{}:{}/ (press Ctrl+C to stop).'.format(host, server.server_address[1]))
+
+		stamps = self.get_watched_files()
+		try:
+			while True:
+				time.sleep(interval)
+				new_stamps = self.get_watched_files()
+				if new_stamps == stamps:
+					continue
+				# wait until the files stop changing (e.g. until Doxygen has finished writing the XML output)
+				while True:
+					stamps = new_stamps
+					time.sleep(interval)
+					new_stamps = self.get_watched_files()
+					if new_stamps == stamps:
+						break
+				start = time.perf_counter()
+				try:
+					self.parse(jobs)
+					summary = self.render(True, jobs)
+				except Exception as e:
+					print('Build failed: {}'.format(e))
+					continue
+				print('Regenerated {} pages in {:.3f} s.'.format(len(summary.pages), time.perf_counter() - start))
+				live_reload.notify()
+		except KeyboardInterrupt:
+			pass
+		finally:
+			server.shutdown()
+			server.server_close()
+
+class LiveReload:
+	# notifies the pages open in the browser whenever the documentation is rebuilt
+	def __init__(self):
+		self.generation = 0
+		self.condition = threading.Condition()
+
+	def notify(self):
+		with self.condition:
+			self.generation += 1
+			self.condition.notify_all()
+
+	def wait(self, generation, timeout):
+		# returns the current generation, once it differs from `generation` or the timeout elapses
+		with self.condition:
+			self.condition.wait_for(lambda : self.generation != generation, timeout)
+			return self.generation
+
+live_reload_path = '/__reload'
+live_reload_script = '<script>new EventSource("' + live_reload_path + '").onmessage = function() { location.reload(); };</script>'
+
+def get_request_handler(directory, live_reload):
+	class RequestHandler(http.server.SimpleHTTPRequestHandler):
+		# serves the files in `directory`, with a live reload script added to each page
+		def __init__(self, *args, **kwargs):
+			super().__init__(*args, directory=directory, **kwargs)
+
+		def do_GET(self):
+			if self.path == live_reload_path:
+				self.send_reloads()
+				return
+			path = self.translate_path(self.path)
+			if os.path.isdir(path) and self.path.split('?')[0].endswith('/'):
+				path = os.path.join(path, 'index.html')
+			# the shared navigation tree is inserted into the pages, so it doesn't get the script
+			if not path.endswith('.html') or os.path.basename(path) == 'nav.html' or not os.path.isfile(path):
+				super().do_GET()
+				return
+			with open(path, 'rb') as f:
+				page = f.read().replace(b'</body>', live_reload_script.encode() + b'</body>', 1)
+			self.send_response(200)
+			self.send_header('Content-Type', 'text/html')
+			self.send_header('Content-Length', str(len(page)))
+			self.send_header('Cache-Control', 'no-cache')
+			self.end_headers()
+			self.wfile.write(page)
+
+		def send_reloads(self):
+			# sends a server-sent event whenever the documentation is rebuilt
+			self.send_response(200)
+			self.send_header('Content-Type', 'text/event-stream')
+			self.send_header('Cache-Control', 'no-cache')
+			self.end_headers()
+			generation = live_reload.generation
+			try:
+				while True:
+					new_generation = live_reload.wait(generation, 15)
+					if new_generation != generation:
+						self.wfile.write(b'data: reload\n\n')
+						generation = new_generation
+					else:
+						# keep the connection alive
+						self.wfile.write(b': ping\n\n')
+					self.wfile.flush()
+			except (BrokenPipeError, ConnectionResetError):
+				pass
+
+		def log_message(self, format, *args):
+			pass
+
+	return RequestHandler
+
+def read_doxyfile_inputs(doxyfile):
+	# returns the paths in the INPUT setting of the given Doxyfile
+	with open(doxyfile, 'r') as f:
+		lines = f.read().replace('\\\n', ' ').splitlines()
+	inputs = []
+	for line in lines:
+		match = re.match(r'\s*INPUT\s*(\+?=)(.*)', line)
+		if match:
+			if match.group(1) == '=':
+				inputs = []
+			inputs.extend(token.strip('"') for token in re.findall(r'"[^"]*"|\S+', match.group(2)))
+	return inputs
+
+def get_input_repositories(inputs):
+	# groups the given Doxygen input paths by repository (the first directory under `src_root`)
+	repositories = {}
+	for path in inputs:
+		sundered = os_path_sunder(get_path(os.path.abspath(path) + os.path.sep))
+		if len(sundered) == 0:
+			raise ValueError('The input "{}" contains every repository.'.format(path))
+		repositories.setdefault(sundered[0], []).append(path)
+	return repositories
+
+def get_tag_file(repository):
+	# returns the absolute path of the Doxygen tag file of the given repository (see `build_repositories`), which is
+	# how Doxygen refers to it in the `external` attribute of the references into it
+	return os.path.abspath(os.path.join(doxygen_dir, repository, repository + '.tag'))
+
+def get_tag_hash(repository):
+	tag_file = get_tag_file(repository)
+	return md5_hash(tag_file) if os.path.isfile(tag_file) else None
+
+external_ref = re.compile(b'<ref [^>]*?external="([^"]*)"')
+
+def get_external_tag_files(xml_dir):
+	# returns the tag files that the references in the given Doxygen XML output point into
+	tag_files = set()
+	for filename in os.listdir(xml_dir):
+		if filename.endswith('.xml'):
+			with open(os.path.join(xml_dir, filename), 'rb') as f:
+				tag_files.update(os.path.abspath(html.unescape(path.decode('utf-8'))) for path in external_ref.findall(f.read()))
+	return tag_files
+
+def has_stale_links(repository, tag_hashes):
+	# returns whether the Doxygen output of the given repository links into a tag file that has changed since Doxygen
+	# read it, given the hashes of the tag files when it started (None for the ones that didn't exist)
+	changed = set(get_tag_file(other) for other, tag_hash in tag_hashes.items() if tag_hash != None and get_tag_hash(other) != tag_hash)
+	return len(changed) > 0 and not changed.isdisjoint(get_external_tag_files(os.path.join(doxygen_dir, repository, 'xml')))
+
+def start_doxygen(doxyfile, repository, inputs, output_dir, tag_files=()):
+	# starts Doxygen with the settings of the given Doxyfile, except that it only reads the given inputs (of a single
+	# repository), and writes its XML output into `output_dir/xml` and its log into `output_dir/doxygen.log`; it also
+	# reads the given tag files (of the other repositories), so that the references to their symbols are linked, and
+	# writes the tag file of this repository to a temporary file next to `get_tag_file(repository)`
+	os.makedirs(output_dir, exist_ok=True)
+	config = '@INCLUDE = "{}"\nINPUT = {}\nOUTPUT_DIRECTORY = "{}"\nXML_OUTPUT = xml\n'.format(os.path.abspath(doxyfile), ' '.join('"' + path + '"' for path in inputs), output_dir)
+	config += 'GENERATE_TAGFILE = "{}"\nTAGFILES += {}\n'.format(get_tag_file(repository) + '.tmp', ' '.join('"' + path + '"' for path in tag_files))
+	with open(os.path.join(output_dir, 'doxygen.log'), 'wb') as log:
+		process = subprocess.Popen(['doxygen', '-'], stdin=subprocess.PIPE, stdout=log, stderr=subprocess.STDOUT)
+	process.stdin.write(config.encode('utf-8'))
+	process.stdin.close()
+	return process
+
+def build_repository(repository, settings, update_registry, incremental):
+	# builds a single repository as a shard (see `build_repositories`), and returns the time at which it started
+	# parsing, the time at which it started rendering, and the time at which it finished
+	builder = DocBuilder(shard=repository, **settings)
+	parse_start = time.time()
+	builder.parse()
+	if update_registry:
+		builder.export_registry()
+	render_start = time.time()
+	builder.render(incremental)
+	return parse_start, render_start, time.time()
+
+class BuildStep:
+	# a step of the build of a repository by `build_repositories`, which started once all of its dependencies finished
+	__slots__ = ('name', 'repository', 'start', 'end', 'dependencies')
+
+	def __init__(self, name, repository, start, end, dependencies):
+		self.name = name
+		self.repository = repository
+		self.start = start
+		self.end = end
+		self.dependencies = dependencies
+
+def build_repositories(doxyfile, jobs=1, incremental=False, **kwargs):
+	# runs Doxygen separately on each repository in the INPUT of the given Doxyfile (with up to `jobs` Doxygen
+	# processes at a time), and builds each repository as a shard in one of `jobs` worker processes as soon as its
+	# XML output is ready; the keyword arguments are the settings of the shards (see `DocBuilder`); returns the
+	# `BuildStep`s of the build
+	#
+	# each Doxygen process reads the tag files of the other repositories, as written by their last Doxygen run (in
+	# this build or the previous one), so that the references to their symbols are linked (through the registries);
+	# once every tag file is up to date, the repositories that link into a tag file that has changed since are run
+	# again; the tag files that didn't exist yet (e.g. on the first build) don't cause a second run, so the references
+	# into them are only linked by the next build
+	DocBuilder(**kwargs).activate()
+	repositories = get_input_repositories(read_doxyfile_inputs(doxyfile))
+	if len(repositories) == 0:
+		raise ValueError('The INPUT of {} contains no repositories.'.format(doxyfile))
+	output_root = doxygen_dir
+	# (the registries of the repositories that are no longer in the INPUT are ignored)
+	shard_settings = {repository : dict(kwargs, xml_dir=os.path.join(output_root, repository, 'xml'), shards=tuple(sorted(repositories))) for repository in repositories}
+	queued, running, building = list(repositories), {}, {}
+	steps, renders, parses, finished = [], {}, [], []
+	tag_hashes, checked_tags = {}, False	# the hashes of the tag files that each Doxygen process read
+	context = multiprocessing.get_context('fork' if 'fork' in multiprocessing.get_all_start_methods() else None)
+	try:
+		with context.Pool(jobs) as pool:
+			while queued or running or building:
+				while queued and len(running) < jobs:
+					# (a repository is only run again once its last build, which reads its XML output, has finished)
+					ready = [repository for repository in queued if repository not in building]
+					if len(ready) == 0:
+						break
+					repository = ready[0]
+					queued.remove(repository)
+					tag_hashes[repository] = {other : get_tag_hash(other) for other in repositories if other != repository}
+					tag_files = [get_tag_file(other) for other, tag_hash in tag_hashes[repository].items() if tag_hash != None]
+					# (once all of the Doxygen processes are running, the next one waits for the last one to finish)
+					dependencies = finished[-1:] + ([renders[repository]] if repository in renders else [])
+					running[repository] = (start_doxygen(doxyfile, repository, repositories[repository], os.path.join(output_root, repository), tag_files), time.time(), dependencies)
+				for repository, (process, start, dependencies) in list(running.items()):
+					if process.poll() == None:
+						continue
+					del running[repository]
+					if process.returncode != 0:
+						raise RuntimeError('Doxygen failed on the repository "{}" (see {}).'.format(repository, os.path.join(output_root, repository, 'doxygen.log')))
+					# (the tag file is replaced once it is complete, since the other Doxygen processes may be reading it)
+					if os.path.isfile(get_tag_file(repository) + '.tmp'):
+						os.replace(get_tag_file(repository) + '.tmp', get_tag_file(repository))
+					step = BuildStep('doxygen', repository, start, time.time(), dependencies)
+					steps.append(step)
+					finished.append(step)
+					building[repository] = (pool.apply_async(build_repository, (repository, shard_settings[repository], True, incremental)), step)
+				if not queued and not running and not checked_tags:
+					# (a tag file only lists the symbols of its own repository, so it doesn't change when the
+					# repository is run again with the updated tag files of the others, and one more pass suffices)
+					checked_tags = True
+					queued = [repository for repository in repositories if has_stale_links(repository, tag_hashes[repository])]
+				for repository, (result, step) in list(building.items()):
+					if not result.ready():
+						continue
+					del building[repository]
+					parse_start, render_start, end = result.get()
+					parses.append(BuildStep('parse', repository, parse_start, render_start, [step]))
+					renders[repository] = BuildStep('render', repository, render_start, end, [parses[-1]])
+					steps.extend([parses[-1], renders[repository]])
+				time.sleep(0.01)
+
+			# the navigation tree and the search index of each shard include the other shards, so the shards that
+			# were rendered before the registries of all of the others were written are rendered again
+			last_registry = max([step.end for step in parses], default=0)
+			results = [(pool.apply_async(build_repository, (repository, shard_settings[repository], False, True)), step) for repository, step in renders.items() if step.start < last_registry]
+			for result, step in results:
+				parse_start, render_start, end = result.get()
+				steps.append(BuildStep('re-render', step.repository, parse_start, end, [step] + parses))
+	finally:
+		for process, start, dependencies in running.values():
+			process.kill()
+	return steps
+
+def get_critical_path(steps):
+	# returns the chain of steps that determined the duration of the build, i.e. the last step to finish, preceded
+	# by its last dependency to finish, and so on
+	path = [max(steps, key=lambda step : step.end)] if len(steps) > 0 else []
+	while len(path) > 0 and len(path[-1].dependencies) > 0:
+		path.append(max(path[-1].dependencies, key=lambda step : step.end))
+	path.reverse()
+	return path
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Converts the Doxygen XML output in Docs/xml into static HTML pages in Docs/html.')
+	parser.add_argument('-j', '--jobs', type=int, default=1, help='number of worker processes used to parse the XML files and to render pages (0 uses all available CPUs)')
+	parser.add_argument('-i', '--incremental', action='store_true', help='only regenerate the pages whose inputs changed since the last build, according to the build manifest')
+	parser.add_argument('--backend', choices=['auto', 'lxml', 'etree'], default=xml_backend, help='the library used to parse the XML and serialize the HTML (by default, lxml is used if it is installed)')
+	parser.add_argument('--lazy', action='store_true', help='drop the parsed descriptions, types, and arguments after parsing them, and reload them from the XML files of the page being rendered, so that peak memory usage scales with the largest page rather than the whole project')
+	parser.add_argument('--low-memory', action='store_true', help='stream the XML files and keep the parsed descriptions serialized until they are rendered, to reduce peak memory usage')
+	parser.add_argument('--shared-nav', action='store_true', help='write the left navigation tree once to nav.html, which is loaded by the script, rather than into every page')
+	parser.add_argument('-v', '--verbose', action='store_true', help='print a summary of the build')
+	parser.add_argument('--profile', action='store_true', help='print the wall time and peak memory of each phase of the build, and the slowest pages and compounds (tracing memory slows down the build)')
+	parser.add_argument('--profile-output', metavar='FILE', help='write cProfile statistics of the main process to FILE, which can be read with pstats')
+	parser.add_argument('--max-page-symbols', type=int, metavar='N', help='give each struct its own page in the files that have more than N documented symbols')
+	parser.add_argument('--max-table-rows', type=int, metavar='N', help='split the member tables with more than N rows into pages of N rows')
+	parser.add_argument('--templates', metavar='DIRECTORY', help='override the markup of the pages with the templates in DIRECTORY, e.g. member_row.html (see default_markup in make_docs.py for the names and slots of the templates)')
+	parser.add_argument('--hash-assets', action='store_true', help='write the stylesheet, script, and images with the hash of their contents in their filenames (e.g. style.<md5>.css), so that they can be served with long-lived cache headers, and list them in assets.json')
+	parser.add_argument('--relative-urls', action='store_true', help='use relative links to the pages and assets, so that the site can be served from any location (e.g. a mirror, or a local directory)')
+	parser.add_argument('--minify', action='store_true', help='collapse the whitespace in the pages and stylesheets, and inline the stylesheets marked "inline" in the templates (replacing the gulp html task)')
+	parser.add_argument('--doxygen', nargs='?', const='Doxyfile', metavar='DOXYFILE', help='first run Doxygen (with the settings in DOXYFILE, by default Doxyfile) separately on each repository in its INPUT, writing the XML output into Docs/doxygen, and build each repository as a shard as soon as its XML output is ready (--jobs Doxygen and worker processes are used)')
+	parser.add_argument('--shard', metavar='REPOSITORY', help='only build the pages of the given repository (the first directory under src_root); links to the other repositories are resolved using the registries in Docs/registry, which each shard build updates')
+	parser.add_argument('--registry-only', action='store_true', help='with --shard, only parse the repository and update its registry (so that all registries can be updated before any shard is rendered)')
+	parser.add_argument('--cache', metavar='DIRECTORY', help='cache the parsed compounds in DIRECTORY, so that later builds only parse the XML files that changed')
+	parser.add_argument('--cache-size', type=int, default=cache_size, metavar='MB', help='the maximum size of the compound cache, in megabytes')
+	parser.add_argument('--export-symbols', metavar='FILE', help='export the parsed symbols (files, structs, functions, variables, and typedefs, along with their parameters, locations, and URLs) to FILE, as an SQLite database if its extension is .db, .sqlite, or .sqlite3, and as line-delimited JSON otherwise')
+	parser.add_argument('--prerender-formulas', metavar='COMMAND', help='prerender the formulas with COMMAND, which reads a JSON list of formulas (in TeX, with their delimiters) from its standard input, and writes a JSON list of their HTML (or null for each formula that it can\'t render) to its standard output; the results are cached in Docs/formulas, and MathJax is only loaded by the pages with formulas that weren\'t prerendered')
+	parser.add_argument('--compress', nargs='+', choices=['gz', 'br'], default=[], help='also write a gzip (gz) and/or brotli (br) compressed copy of every output file, e.g. index.html.gz')
+	parser.add_argument('--no-search', action='store_true', help='don\'t generate the search index and the search box')
+	parser.add_argument('-w', '--watch', action='store_true', help='after building, serve the documentation locally, and regenerate the affected pages (and reload them in the browser) whenever the XML output, templates, or assets change')
+	parser.add_argument('--port', type=int, default=8000, help='the port on which the documentation is served in watch mode')
+	parser.add_argument('--bind', default='127.0.0.1', metavar='ADDRESS', help='the address on which the documentation is served in watch mode (e.g. 0.0.0.0 to serve it to the whole network)')
+	args = parser.parse_args()
+	jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+	try:
+		set_xml_backend(args.backend)
+	except ValueError as e:
+		parser.error(str(e))
+	if 'br' in args.compress and brotli == None:
+		parser.error('Brotli compression was requested, but brotli is not installed.')
+	builder_settings = dict(xml_backend=args.backend, low_memory=args.low_memory, lazy_load=args.lazy, shared_nav=args.shared_nav, search_index=not args.no_search, max_page_symbols=args.max_page_symbols, max_table_rows=args.max_table_rows, template_dir=args.templates, hashed_assets=args.hash_assets, relative_urls=args.relative_urls, minify=args.minify, cache_dir=args.cache, cache_size=args.cache_size, formula_renderer=args.prerender_formulas, compress=tuple(args.compress))
+	if args.doxygen != None:
+		if args.shard != None or args.registry_only or args.watch or args.export_symbols != None:
+			parser.error('--doxygen can\'t be combined with --shard, --registry-only, --watch, or --export-symbols.')
+		try:
+			steps = build_repositories(args.doxygen, jobs, args.incremental, **builder_settings)
+		except (OSError, ValueError, RuntimeError) as e:
+			parser.exit(1, 'Build failed: {}\n'.format(e))
+		critical_path = get_critical_path(steps)
+		if len(critical_path) == 0:
+			parser.exit(1, 'Build failed: no repositories were built.\n')
+		print('Critical path ({:.3f} s):'.format(critical_path[-1].end - min(step.start for step in steps)))
+		for i, step in enumerate(critical_path):
+			if i > 0 and step.start - critical_path[i - 1].end > 0.01:
+				print('{:>10.3f} s  (waiting)'.format(step.start - critical_path[i - 1].end))
+			print('{:>10.3f} s  {} {}'.format(step.end - step.start, step.name, step.repository))
+		doxygen_steps = [step for step in steps if step.name == 'doxygen']
+		print('Doxygen took {:.3f} s in total, in {} runs over {} repositories.'.format(sum(step.end - step.start for step in doxygen_steps), len(doxygen_steps), len(set(step.repository for step in doxygen_steps))))
+		parser.exit()
+	builder = DocBuilder(shard=args.shard, symbols_file=args.export_symbols, **builder_settings)
+	if args.watch:
+		# the links and assets of the pages must point to the local server
+		builder.settings['url_root'] = '/'
+
+	# (tracing memory slows down allocation, which would skew the cProfile statistics of --profile-output)
+	if args.profile:
+		profiler.start()
+	if args.profile_output != None:
+		python_profiler = cProfile.Profile()
+		python_profiler.enable()
+	if args.registry_only:
+		if args.shard == None:
+			parser.error('--registry-only requires --shard.')
+		builder.parse()
+		builder.export_registry()
+		parser.exit()
+	summary = builder.build(args.incremental, jobs)
+	page_stats = summary.page_stats
+
+	if args.profile_output != None:
+		python_profiler.disable()
+		python_profiler.dump_stats(args.profile_output)
+	if args.verbose:
+		print('Generated {} pages ({} unchanged, {} removed); {} had new contents.'.format(len(summary.pages), summary.unchanged, len(summary.removed), sum(1 for stats in page_stats if stats.written)))
+		print('Render cache: {} hits, {} misses.'.format(sum(stats.cache_hits for stats in page_stats), sum(stats.cache_misses for stats in page_stats)))
+	if args.profile:
+		# the render and write times are summed over all worker processes
+		for stats in page_stats:
+			profiler.page_times[stats.key] = stats.render_time + stats.write_time
+		profiler.phases.append(('  render (total)', sum(stats.render_time for stats in page_stats), max([stats.render_peak for stats in page_stats], default=0)))
+		profiler.phases.append(('  write (total)', sum(stats.write_time for stats in page_stats), max([stats.write_peak for stats in page_stats], default=0)))
+		profiler.report()
+	if args.watch:
+		builder.watch(args.port, jobs=jobs, bind=args.bind)
@@ -46,6 +46,8 @@ paths.cssFilesGlob   = paths.cssFiles  + paths.cssPattern;
 paths.jsFilesGlob    = paths.jsFiles    + paths.jsPattern;
 paths.imageFilesGlob = paths.imageFiles + paths.imagePattern;
 paths.assetFilesGlob = paths.assetFiles + paths.assetPattern;
+// The files that the scripts fetch at runtime (the search index shards, the shared navigation tree, and the hashed asset names).
+paths.dataFilesGlob  = [paths.assetFiles + '/search/*.json', paths.assetFiles + '/nav.html', paths.assetFiles + '/assets.json'];
 
 // Site files globs
 paths.siteHtmlFilesGlob = paths.siteDir + paths.htmlPattern;
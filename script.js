@@ -1,172 +1,373 @@
-navbar = $('#header');
-leftnav = $('#leftnav');
-rightnav = $('#rightnav');
-contents = $('#container');
-embedded_nav = $('#embedded_nav')
-menu = $('#menu');
-toc = $('#toc');
-overlay = $('#overlay');
-sidebar = $('#sidebar');
-footer = $('#footer');
-
-/* see: http://jsfiddle.net/mekwall/up4nu/ */
-navs = rightnav.find('a');
-anchors = navs.map(function() {
-	return $('a[id^="' + $(this).attr('href').substring(1) + '"]');
+navbar = document.getElementById('header');
+leftnav = document.getElementById('leftnav');
+rightnav = document.getElementById('rightnav');
+contents = document.getElementById('container');
+embedded_nav = document.getElementById('embedded_nav');
+menu = document.getElementById('menu');
+toc = document.getElementById('toc');
+overlay = document.getElementById('overlay');
+sidebar = document.getElementById('sidebar');
+footer = document.getElementById('footer');
+
+/* the anchor of each link in the table of contents, whose offsets are only measured when the layout changes */
+navs = [];
+anchors = [];
+Array.prototype.forEach.call(rightnav.getElementsByTagName('a'), function(nav) {
+	var anchor = document.getElementById(nav.getAttribute('href').substring(1));
+	if (anchor) {
+		navs.push(nav);
+		anchors.push(anchor);
+	}
 });
+anchor_tops = [];
+layout_height = -1;
 is_nav_embedded = false;
 is_collapsed = false;
 
-max_width = parseInt(contents.css('max-width'));
-leftnav_width = parseInt(leftnav.css('width'));
-rightnav_width = parseInt(rightnav.css('width'));
-toc_width = parseInt(toc.css('width'));
+max_width = parseInt(getComputedStyle(contents).maxWidth);
+leftnav_width = parseInt(getComputedStyle(leftnav).width);
+rightnav_width = parseInt(getComputedStyle(rightnav).width);
+toc_width = parseInt(getComputedStyle(toc).width);
 nav_margin = 35;
 min_pad = 20;
 threshold = 795;
 
-offset = 0
-if (anchors.length > 0)
-	offset = -anchors[0].offset().top;
 prev_nav = 0;
+scroll_offset = 0;	/* the scroll position relative to the current anchor, which is preserved when the window is resized */
 scrolling = true;
+frame_requested = false;
+
+function update_anchor_tops() {
+	/* reading all offsets at once only forces a single layout */
+	var scroll = window.pageYOffset;
+	for (var i = 0; i < anchors.length; i++)
+		anchor_tops[i] = anchors[i].getBoundingClientRect().top + scroll;
+	layout_height = document.documentElement.scrollHeight;
+}
+
+function get_anchor_top(i) {
+	/* the offsets change whenever the height of the page does (e.g. once the stylesheets, fonts, or formulas are loaded) */
+	if (document.documentElement.scrollHeight != layout_height)
+		update_anchor_tops();
+	return anchor_tops[i];
+}
+
+function find_current_anchor(scroll) {
+	/* returns the last anchor above the given scroll position (or the first anchor) */
+	get_anchor_top(0);
+	var lo = 0, hi = anchor_tops.length;
+	while (lo < hi) {
+		var mid = (lo + hi) >> 1;
+		if (scroll + 1 < anchor_tops[mid]) hi = mid;
+		else lo = mid + 1;
+	}
+	return Math.max(lo - 1, 0);
+}
+
+function get_left(doc_width) {
+	if (window.matchMedia('(max-width: ' + threshold + 'px)').matches)
+		return min_pad;
+	return Math.max(Math.min((doc_width - width) / 2, doc_width - width - nav_margin - rightnav_width - min_pad), min_pad + leftnav_width + nav_margin);
+}
+
+function update_leftnav_position(doc_width, left) {
+	var x_offset = document.documentElement.clientWidth - window.innerWidth - window.pageXOffset;
+	if (left - nav_margin - leftnav_width <= min_pad)
+		leftnav.style.right = (doc_width - min_pad - leftnav_width - x_offset) + 'px';
+	else leftnav.style.right = (doc_width - left + nav_margin - x_offset) + 'px';
+}
+
+function embed_nav() {
+	if (!is_nav_embedded) {
+		embedded_nav.appendChild(toc);
+		toc.style.width = 'auto';
+		rightnav.style.display = 'none';
+		is_nav_embedded = true;
+	}
+}
+
+function expand_menu() {
+	if (is_collapsed) {
+		leftnav.appendChild(menu);
+		navbar.style.display = 'none';
+		leftnav.style.display = 'block';
+		contents.style.marginTop = 0;
+		is_collapsed = false;
+	}
+}
 
 function update_navs(scroll) {
-	doc_width = $(window).innerWidth();
-	doc_height = $(window).height();
+	doc_width = document.documentElement.clientWidth;
+	doc_height = document.documentElement.clientHeight;
 	width = Math.min(max_width, doc_width - 2 * (min_pad + nav_margin) - leftnav_width - rightnav_width);
 	left = Math.max(Math.min((doc_width - width) / 2, doc_width - width - nav_margin - rightnav_width - min_pad), min_pad + leftnav_width + nav_margin);
 
 	if (window.matchMedia('(max-width: ' + threshold + 'px)').matches) {
-		if (!is_nav_embedded) {
-			toc.detach().appendTo(embedded_nav);
-			toc.css('width', 'auto');
-			rightnav.css('display', 'none');
-			is_nav_embedded = true;
-		} if (!is_collapsed) {
-			menu.detach().appendTo(sidebar);
-			navbar.css('display', 'block');
-			leftnav.css('display', 'none');
-			contents.css('margin-top', '65px');
+		embed_nav();
+		if (!is_collapsed) {
+			sidebar.appendChild(menu);
+			navbar.style.display = 'block';
+			leftnav.style.display = 'none';
+			contents.style.marginTop = '65px';
 			is_collapsed = true;
 		}
 		width = doc_width - 2 * min_pad;
 		left = min_pad;
 	} else if (width < max_width - nav_margin - rightnav_width) {
-		if (!is_nav_embedded) {
-			toc.detach().appendTo(embedded_nav);
-			toc.css('width', 'auto');
-			rightnav.css('display', 'none');
-			is_nav_embedded = true;
-		} if (is_collapsed) {
-			menu.detach().appendTo(leftnav);
-			navbar.css('display', 'none');
-			leftnav.css('display', 'block');
-			contents.css('margin-top', 0);
-			is_collapsed = false;
-		}
+		embed_nav();
+		expand_menu();
 		width = doc_width - 2 * min_pad - nav_margin - leftnav_width;
 	} else {
 		if (is_nav_embedded) {
-			toc.detach().appendTo(rightnav);
-			toc.css('width', toc_width);
-			rightnav.css('display', 'block');
+			rightnav.appendChild(toc);
+			toc.style.width = toc_width + 'px';
+			rightnav.style.display = 'block';
 			is_nav_embedded = false;
-		} if (is_collapsed) {
-			menu.detach().appendTo(leftnav);
-			navbar.css('display', 'none');
-			leftnav.css('display', 'block');
-			contents.css('margin-top', 0);
-			is_collapsed = false;
 		}
+		expand_menu();
 	}
 
-	leftnav_x = left - nav_margin - leftnav_width;
-	offset = document.documentElement.clientWidth - window.innerWidth - window.pageXOffset;
-	if (leftnav_x <= min_pad) {
-		leftnav.css('right', doc_width - min_pad - leftnav_width - offset);
-		rightnav.css('left', leftnav_width + min_pad + width + 2 * nav_margin);
-		contents.css('width', width);
-		contents.css('margin-left', leftnav_width + nav_margin + min_pad);
+	update_leftnav_position(doc_width, left);
+	if (left - nav_margin - leftnav_width <= min_pad) {
+		rightnav.style.left = (leftnav_width + min_pad + width + 2 * nav_margin) + 'px';
+		contents.style.width = width + 'px';
 	} else {
-		leftnav.css('right', doc_width - left + nav_margin - offset);
-		rightnav.css('left', left + width + nav_margin);
-		contents.css('width', max_width);
-		contents.css('margin-left', 'auto');
+		rightnav.style.left = (left + width + nav_margin) + 'px';
+		contents.style.width = max_width + 'px';
 	}
-	contents.css('margin-left', left);
-	update_nav_height(doc_height, scroll);
+	contents.style.marginLeft = left + 'px';
+	update_nav_height(doc_height);
 }
 
-function update_nav_height(doc_height, scroll) {
-	nav_height = Math.min(footer.offset().top - scroll, doc_height - 5);
-	leftnav.css('max-height', nav_height - 60);
-	rightnav.css('max-height', nav_height - 60);
+function update_nav_height(doc_height) {
+	var nav_height = Math.min(footer.getBoundingClientRect().top, doc_height - 5);
+	leftnav.style.maxHeight = (nav_height - 60) + 'px';
+	rightnav.style.maxHeight = (nav_height - 60) + 'px';
 }
 
-$(window).resize(function() {
-	scroll = $(window).scrollTop();
-	update_navs(scroll);
+function on_scroll() {
+	frame_requested = false;
+	update_leftnav_position(doc_width, get_left(doc_width));
+	if (!scrolling) return;
+
+	var scroll = window.pageYOffset;
+	if (anchors.length > 0) {
+		var i = find_current_anchor(scroll);
+		scroll_offset = scroll - anchor_tops[i];
+		if (i != prev_nav) {
+			navs[prev_nav].classList.remove('active');
+			navs[i].classList.add('active');
+			prev_nav = i;
+		}
+	} else scroll_offset = scroll;
+
+	update_nav_height(document.documentElement.clientHeight);
+}
+
+/* the layout is only read once per frame, however many scroll events there are */
+window.addEventListener('scroll', function() {
+	if (!frame_requested) {
+		frame_requested = true;
+		window.requestAnimationFrame(on_scroll);
+	}
+}, {passive: true});
+
+window.addEventListener('resize', function() {
+	update_navs(window.pageYOffset);
 	scrolling = false;
-	if (anchors.length > 0)
-		$(this).scrollTop(anchors[prev_nav].offset().top + offset);
-	else $(this).scrollTop(offset);
+	if (anchors.length > 0) {
+		update_anchor_tops();
+		window.scrollTo(window.pageXOffset, anchor_tops[prev_nav] + scroll_offset);
+	} else window.scrollTo(window.pageXOffset, scroll_offset);
 	scrolling = true;
 });
 
-$(window).scroll(function() {
-	left = Math.max(Math.min((doc_width - width) / 2, doc_width - width - nav_margin - rightnav_width - min_pad), min_pad + leftnav_width + nav_margin);
-	if (window.matchMedia('(max-width: ' + threshold + 'px)').matches)
-		left = min_pad;
-	leftnav_x = left - nav_margin - leftnav_width;
-	offset = document.documentElement.clientWidth - window.innerWidth - window.pageXOffset;
-	if (leftnav_x <= min_pad)
-		leftnav.css('right', doc_width - min_pad - leftnav_width - offset);
-	else leftnav.css('right', doc_width - left + nav_margin - offset);
+function toggle(element) {
+	element.style.display = (element.style.display == 'none' ? '' : 'none');
+}
 
-	if (!scrolling) return;
+function get_children(element, selector) {
+	return Array.prototype.filter.call(element.children, function(child) { return child.matches(selector); });
+}
+
+menu.addEventListener('click', function(e) {
+	var toggler = e.target.closest('label.tree-toggler');
+	if (!toggler) return;
+	toggler.textContent = (toggler.textContent == '+' ? '-' : '+');
+	get_children(toggler.parentNode.parentNode, 'ul.tree').forEach(toggle);
+});
+
+/* if the navigation tree is shared across pages, load it and expand the path to the current page */
+if (menu.getAttribute('data-nav')) {
+	var nav_url = new URL(menu.getAttribute('data-nav'), document.baseURI);
+	fetch(nav_url).then(function(response) { return response.text(); }).then(function(data) {
+		get_children(menu, 'ul')[0].innerHTML = data;
+		/* the links in the navigation tree may be relative to it, rather than to this page */
+		var links = menu.getElementsByTagName('a');
+		Array.prototype.forEach.call(links, function(link) { link.setAttribute('href', new URL(link.getAttribute('href'), nav_url).href); });
+		var page = new URL(menu.getAttribute('data-page'), document.baseURI).href;
+		var current = Array.prototype.find.call(links, function(link) { return link.getAttribute('href') == page; });
+		if (!current) return;
+		current.parentNode.classList.add('active');
+		for (var item = current.parentNode.closest('li'); item && menu.contains(item); item = item.parentNode.closest('li')) {
+			get_children(item, 'ul.tree').forEach(function(tree) { tree.style.display = ''; });
+			get_children(item, 'div').forEach(function(div) {
+				get_children(div, 'label.tree-toggler').forEach(function(toggler) { toggler.textContent = '-'; });
+			});
+		}
+		current.replaceWith(current.textContent);
+	});
+}
+
+/* only one page of the rows of each paginated member table is displayed at a time */
+document.addEventListener('click', function(e) {
+	var link = e.target.closest('.table-pager > a');
+	if (!link) return;
+	e.preventDefault();
+	var links = link.parentNode.children;
+	var pages = get_children(link.parentNode.previousElementSibling, 'tbody.table-page');
+	for (var i = 0; i < pages.length; i++) {
+		pages[i].style.display = (links[i] == link ? '' : 'none');
+		links[i].classList.toggle('active', links[i] == link);
+	}
+});
+
+/* search the documented symbols, fetching only the shards of the search index that match the query */
+search_box = document.getElementById('search_box');
+search_results = document.getElementById('search_results');
+search_index = null;
+search_index_request = null;	/* the pending request of the index, so that it's only fetched once */
+search_shards = {};
+search_shard_requests = {};
+max_search_results = 50;
 
-	i = 0;
-	scroll = $(window).scrollTop();
-	for (; i < anchors.length; i++) {
-		if (scroll + 1 < anchors[i].offset().top) break;
+function get_search_shards(query) {
+	var prefixes = [];
+	for (var prefix in search_index.shards) {
+		if (prefix.startsWith(query) || query.startsWith(prefix))
+			prefixes.push(prefix);
 	}
-	i = Math.max(i - 1, 0);
-	if (anchors.length > 0)
-		offset = scroll - anchors[i].offset().top;
-	else offset = scroll;
-
-	if (i != prev_nav) {
-		$(navs[prev_nav]).removeClass('active');
-		$(navs[i]).addClass('active');
-		prev_nav = i;
+	return prefixes;
+}
+
+function find_symbols(shard, query, results) {
+	/* the symbols in each shard are sorted by their lowercase name, so find the first one with the query as a prefix */
+	var symbols = shard.symbols;
+	var lo = 0, hi = symbols.length;
+	while (lo < hi) {
+		var mid = (lo + hi) >> 1;
+		if (symbols[mid][0].toLowerCase() < query) lo = mid + 1;
+		else hi = mid;
 	}
+	for (var i = lo; i < symbols.length && symbols[i][0].toLowerCase().startsWith(query); i++)
+		results.push([symbols[i], shard.files[symbols[i][4]]]);
+}
 
-	update_nav_height($(window).height(), scroll);
-});
+function create_element(tag, class_name, text) {
+	var element = document.createElement(tag);
+	element.className = class_name;
+	element.textContent = text;
+	return element;
+}
 
-$('label.tree-toggler').click(function () {
-	if ($(this).text() == '+')
-		$(this).text('-');
-	else $(this).text('+');
-	$(this).parent().parent().children('ul.tree').toggle(300);
-});
+function search(text) {
+	/* the text after the last '::' is matched against the names, and the text before it against the qualifiers */
+	var i = text.lastIndexOf('::');
+	var query = text.substring(i < 0 ? 0 : i + 2).toLowerCase();
+	var qualifier = (i < 0 ? '' : text.substring(0, i + 2).toLowerCase());
+	if (query.length == 0) {
+		search_results.textContent = '';
+		return;
+	}
+	var prefixes = get_search_shards(query);
+	var missing = prefixes.filter(function(prefix) { return !(prefix in search_shards); });
+	if (missing.length > 0) {
+		Promise.all(missing.map(function(prefix) {
+			if (!(prefix in search_shard_requests)) {
+				search_shard_requests[prefix] = fetch(search_index.root + 'search/' + search_index.shards[prefix]).then(function(response) { return response.json(); }).then(function(shard) {
+					search_shards[prefix] = shard;
+				}, function(error) {
+					delete search_shard_requests[prefix];
+					throw error;
+				});
+			}
+			return search_shard_requests[prefix];
+		})).then(function() {
+			if (search_box.value.trim() == text) search(text);
+		});
+		return;
+	}
 
-$('[data-toggle="openmenu"]').click(function () {
-	overlay.css('z-index', 999);
-	sidebar.addClass('toggled');
-	overlay.addClass('toggled');
+	var results = [];
+	prefixes.forEach(function(prefix) { find_symbols(search_shards[prefix], query, results); });
+	results = results.filter(function(result) { return result[0][1].toLowerCase().endsWith(qualifier); });
+	results.sort(function(a, b) { return a[0][0].length - b[0][0].length || (a[0][0] < b[0][0] ? -1 : (a[0][0] > b[0][0] ? 1 : 0)); });
+	search_results.textContent = '';
+	results.slice(0, max_search_results).forEach(function(result) {
+		var symbol = result[0];
+		var link = document.createElement('a');
+		link.setAttribute('href', search_index.root + result[1] + '.html#' + symbol[5]);
+		link.setAttribute('title', symbol[3]);
+		link.appendChild(create_element('span', 'search_name', symbol[1] + symbol[0]));
+		link.appendChild(create_element('span', 'search_kind', symbol[2] + ' in ' + result[1].split('/').pop()));
+		var item = create_element('li', 'toc_item', '');
+		item.appendChild(link);
+		search_results.appendChild(item);
+	});
+	if (results.length == 0)
+		search_results.appendChild(create_element('li', 'search_empty', 'No results'));
+}
+
+if (search_box) {
+	search_box.addEventListener('input', function() {
+		var text = search_box.value.trim();
+		if (search_index == null) {
+			/* the index is searched with the text at the time it arrives, so later keystrokes just wait for it */
+			if (search_index_request == null) {
+				var index_url = new URL(search_box.getAttribute('data-index'), document.baseURI);
+				search_index_request = fetch(index_url, {cache: 'no-cache'}).then(function(response) { return response.json(); }).then(function(index) {
+					/* the root of the site may be relative to the index, rather than to this page */
+					index.root = new URL(index.root, index_url).href;
+					search_index = index;
+					search(search_box.value.trim());
+				}, function() {
+					search_index_request = null;
+				});
+			}
+		} else search(text);
+	});
+
+	search_box.addEventListener('keydown', function(e) {
+		if (e.key == 'Enter') {
+			var first = search_results.querySelector('a');
+			if (first) window.location.href = first.getAttribute('href');
+		} else if (e.key == 'Escape') {
+			search_box.value = '';
+			search_results.textContent = '';
+		}
+	});
+}
+
+document.querySelectorAll('[data-toggle="openmenu"]').forEach(function(button) {
+	button.addEventListener('click', function() {
+		overlay.style.zIndex = 999;
+		sidebar.classList.add('toggled');
+		overlay.classList.add('toggled');
+	});
 });
 
-$('[data-toggle="closemenu"]').click(function () {
-	sidebar.removeClass('toggled');
-	overlay.removeClass('toggled');
-	setTimeout(function(){ overlay.css('z-index', -1000); }, 500);
+document.querySelectorAll('[data-toggle="closemenu"]').forEach(function(button) {
+	button.addEventListener('click', function() {
+		sidebar.classList.remove('toggled');
+		overlay.classList.remove('toggled');
+		setTimeout(function() { overlay.style.zIndex = -1000; }, 500);
+	});
 });
 
-scroll = $(window).scrollTop();
-update_navs(scroll);
+update_navs(window.pageYOffset);
+if (anchors.length > 0)
+	scroll_offset = window.pageYOffset - get_anchor_top(0);
 if (!is_collapsed)
-	leftnav.css('display', 'block');
+	leftnav.style.display = 'block';
 if (!is_nav_embedded)
-	rightnav.css('display', 'block');
+	rightnav.style.display = 'block';
@@ -0,0 +1,69 @@
+import os
+import sys
+import tempfile
+import unittest
+from shutil import rmtree
+
+repository_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, repository_dir)
+sys.path.insert(0, os.path.join(repository_dir, 'benchmarks'))
+import make_docs
+from generate_corpus import generate_corpus
+
+# the modes in which both backends are compared: the settings of the builder, and the number of jobs
+modes = {
+	'default' : ({}, 1),
+	'low_memory' : ({'low_memory' : True}, 1),
+	'lazy_load' : ({'lazy_load' : True}, 1),
+	'jobs' : ({}, 2)
+}
+
+def read_tree(directory):
+	# returns the contents of every file in the given directory, keyed by their relative paths
+	contents = {}
+	for dirpath, dirnames, filenames in os.walk(directory):
+		for filename in filenames:
+			filepath = os.path.join(dirpath, filename)
+			with open(filepath, 'rb') as f:
+				contents[os.path.relpath(filepath, directory)] = f.read()
+	return contents
+
+@unittest.skipIf(make_docs.lxml == None, 'lxml is not installed')
+class BackendTest(unittest.TestCase):
+	# builds the synthetic benchmark corpus with both XML backends, and checks that the HTML output is identical
+
+	@classmethod
+	def setUpClass(cls):
+		cls.work_dir = tempfile.mkdtemp()
+		# the source repositories are siblings of the 'archivist' directory, whose parent is `src_root`
+		cls.src_root = cls.work_dir + os.path.sep
+		cls.xml_dir = os.path.join(cls.work_dir, 'archivist', 'Docs', 'xml')
+		generate_corpus(cls.xml_dir, cls.src_root, repos=2, files=3, structs=2, members=5)
+
+	@classmethod
+	def tearDownClass(cls):
+		rmtree(cls.work_dir, True)
+
+	def build(self, backend, mode):
+		settings, jobs = modes[mode]
+		output_dir = os.path.join(self.work_dir, 'archivist', 'Docs', backend + '_' + mode)
+		builder = make_docs.DocBuilder(xml_dir=self.xml_dir, html_dir=os.path.join(output_dir, 'html'),
+			manifest_file=os.path.join(output_dir, 'manifest.json'), src_root=self.src_root, xml_backend=backend,
+			header_file=os.path.join(repository_dir, 'header.html'), footer_file=os.path.join(repository_dir, 'footer.html'),
+			style_file=os.path.join(repository_dir, 'style.css'), script_file=os.path.join(repository_dir, 'script.js'),
+			hamburger_file=os.path.join(repository_dir, 'hamburger.svg'), critical_file=os.path.join(repository_dir, 'critical.css'), **settings)
+		builder.build(jobs=jobs)
+		return read_tree(os.path.join(output_dir, 'html'))
+
+	def test_identical_output(self):
+		for mode in modes:
+			with self.subTest(mode=mode):
+				etree_output = self.build('etree', mode)
+				lxml_output = self.build('lxml', mode)
+				self.assertGreater(len(etree_output), 0)
+				self.assertEqual(sorted(etree_output), sorted(lxml_output))
+				for path in etree_output:
+					self.assertEqual(etree_output[path], lxml_output[path], path)
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,90 @@
+import os
+import re
+import json
+import sys
+import tempfile
+import unittest
+from shutil import rmtree
+
+repository_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, repository_dir)
+sys.path.insert(0, os.path.join(repository_dir, 'benchmarks'))
+import make_docs
+from generate_corpus import generate_corpus
+
+class BuildTest(unittest.TestCase):
+	# builds the synthetic benchmark corpus, and checks the outputs of consecutive builds
+
+	def setUp(self):
+		self.work_dir = tempfile.mkdtemp()
+		self.src_root = self.work_dir + os.path.sep
+		self.docs_dir = os.path.join(self.work_dir, 'archivist', 'Docs')
+		generate_corpus(os.path.join(self.docs_dir, 'xml'), self.src_root, repos=2, files=3, structs=2, members=5)
+
+	def tearDown(self):
+		rmtree(self.work_dir, True)
+
+	def get_builder(self, **settings):
+		return make_docs.DocBuilder(xml_dir=os.path.join(self.docs_dir, 'xml'), html_dir=os.path.join(self.docs_dir, 'html'),
+			manifest_file=os.path.join(self.docs_dir, 'manifest.json'), registry_dir=os.path.join(self.docs_dir, 'registry'), src_root=self.src_root,
+			header_file=os.path.join(repository_dir, 'header.html'), footer_file=os.path.join(repository_dir, 'footer.html'),
+			style_file=os.path.join(repository_dir, 'style.css'), script_file=os.path.join(repository_dir, 'script.js'),
+			hamburger_file=os.path.join(repository_dir, 'hamburger.svg'), critical_file=os.path.join(repository_dir, 'critical.css'), **settings)
+
+	def test_inlined_stylesheet(self):
+		# the stylesheet compiled by the gulp build is inlined by every build, rather than removed as a stale output
+		compiled_file = os.path.join(self.docs_dir, 'html', 'compiled_critical.css')
+		os.makedirs(os.path.dirname(compiled_file))
+		with open(compiled_file, 'w') as f:
+			f.write('.compiled { color : red; }\n')
+		styles = []
+		for i in range(2):
+			self.get_builder(minify=True).build()
+			styles.append(set())
+			for dirpath, dirnames, filenames in os.walk(os.path.join(self.docs_dir, 'html')):
+				for filename in filenames:
+					if filename.endswith('.html'):
+						with open(os.path.join(dirpath, filename), 'r') as f:
+							styles[-1].update(re.findall(r'<style>(.*?)</style>', f.read()))
+		self.assertTrue(os.path.isfile(compiled_file))
+		self.assertIn('.compiled{color : red}', styles[0])
+		self.assertEqual(styles[1], styles[0])
+
+	def test_qualified_names(self):
+		# structs with the same name in different namespaces have different qualified names in the symbol export
+		xml_dir = os.path.join(self.docs_dir, 'xml')
+		with open(os.path.join(xml_dir, 'structrepo0_f0_s1.xml'), 'r') as f:
+			compound = f.read()
+		with open(os.path.join(xml_dir, 'structother_s1.xml'), 'w') as f:
+			f.write(compound.replace('structrepo0_f0_s1', 'structother_s1').replace('<compoundname>ns::', '<compoundname>other::'))
+		with open(os.path.join(xml_dir, 'index.xml'), 'r') as f:
+			index = f.read()
+		with open(os.path.join(xml_dir, 'index.xml'), 'w') as f:
+			f.write(index.replace('</doxygenindex>', '<compound refid="structother_s1" kind="struct"><name>other::S0_1</name></compound></doxygenindex>'))
+
+		symbols_file = os.path.join(self.docs_dir, 'symbols.jsonl')
+		builder = self.get_builder()
+		builder.parse()
+		builder.export_symbols(symbols_file)
+		with open(symbols_file, 'r') as f:
+			records = [json.loads(line) for line in f]
+		structs = set(record['qualified_name'] for record in records if record['kind'] == 'struct' and record['name'] == 'S0_1')
+		self.assertEqual(structs, {'ns::S0_1', 'other::S0_1'})
+		members = set(record['qualified_name'] for record in records if record['name'] == 'field0')
+		self.assertIn('other::S0_1::field0', members)
+		self.assertIn('ns::S0_1::field0', members)
+
+	def test_formula_cache_keys(self):
+		# each function renderer has its own formula cache entries, and the ones without a unique name are rejected
+		def get_cache_file(renderer):
+			make_docs.DocBuilder(formula_renderer=renderer, formula_cache_dir=os.path.join(self.docs_dir, 'formulas')).activate()
+			return make_docs.get_formula_cache_file('$x^2$')
+		first, second = (lambda texts : texts), (lambda texts : [None] * len(texts))
+		first.renderer_id, second.renderer_id = 'first', 'second'
+		self.assertNotEqual(get_cache_file(first), get_cache_file(second))
+		self.assertNotEqual(get_cache_file(first), get_cache_file(make_docs.run_formula_renderer))
+		with self.assertRaises(ValueError):
+			get_cache_file(lambda texts : texts)
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,82 @@
+import os
+import sys
+import stat
+import tempfile
+import unittest
+from shutil import rmtree
+
+repository_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, repository_dir)
+import make_docs
+
+# a stand-in for Doxygen, which writes the synthetic benchmark corpus as the XML output, writes the tag file given in
+# 'tags/REPOSITORY' (if any), and links 'repo0' (but not 'repo1') to the symbols of the tag files that it reads
+fake_doxygen = '''#!{python}
+import os, re, sys
+sys.path.insert(0, {benchmarks_dir!r})
+from generate_corpus import generate_corpus
+config = sys.stdin.read()
+output_dir = re.search(r'^OUTPUT_DIRECTORY = "(.*)"$', config, re.M).group(1)
+tag_file = re.search(r'^GENERATE_TAGFILE = "(.*)"$', config, re.M).group(1)
+tag_files = re.findall(r'"([^"]*)"', re.search(r'^TAGFILES \\+=(.*)$', config, re.M).group(1))
+repository = os.path.basename(output_dir)
+generate_corpus(os.path.join(output_dir, 'xml'), {src_root!r}, repos=2, files=2, structs=1, members=2)
+tag_source = os.path.join({work_dir!r}, 'tags', repository)
+with open(tag_file, 'w') as f:
+	f.write(open(tag_source).read() if os.path.isfile(tag_source) else repository)
+if repository == 'repo0':
+	with open(os.path.join(output_dir, 'xml', 'external.xml'), 'w') as f:
+		f.write(''.join('<ref refid="x" kindref="member" external="{{}}">x</ref>'.format(path) for path in tag_files))
+'''
+
+@unittest.skipIf(os.name != 'posix', 'the fake doxygen is a script')
+class DoxygenTest(unittest.TestCase):
+	# runs `build_repositories` with a fake doxygen, and checks which repositories are run through Doxygen again
+
+	def setUp(self):
+		self.work_dir = tempfile.mkdtemp()
+		self.src_root = self.work_dir + os.path.sep
+		self.docs_dir = os.path.join(self.work_dir, 'archivist', 'Docs')
+		os.makedirs(os.path.join(self.work_dir, 'bin'))
+		os.makedirs(os.path.join(self.work_dir, 'tags'))
+		doxygen = os.path.join(self.work_dir, 'bin', 'doxygen')
+		with open(doxygen, 'w') as f:
+			f.write(fake_doxygen.format(python=sys.executable, benchmarks_dir=os.path.join(repository_dir, 'benchmarks'), src_root=self.src_root, work_dir=self.work_dir))
+		os.chmod(doxygen, os.stat(doxygen).st_mode | stat.S_IEXEC)
+		self.doxyfile = os.path.join(self.work_dir, 'Doxyfile')
+		with open(self.doxyfile, 'w') as f:
+			f.write('INPUT = "{}" "{}"\n'.format(os.path.join(self.work_dir, 'repo0'), os.path.join(self.work_dir, 'repo1')))
+		self.path = os.environ['PATH']
+		os.environ['PATH'] = os.path.join(self.work_dir, 'bin') + os.pathsep + self.path
+
+	def tearDown(self):
+		os.environ['PATH'] = self.path
+		rmtree(self.work_dir, True)
+
+	def set_tag(self, repository, text):
+		with open(os.path.join(self.work_dir, 'tags', repository), 'w') as f:
+			f.write(text)
+
+	def build(self, jobs):
+		# returns the repositories in the order in which Doxygen finished on them
+		steps = make_docs.build_repositories(self.doxyfile, jobs, src_root=self.src_root,
+			html_dir=os.path.join(self.docs_dir, 'html'), manifest_file=os.path.join(self.docs_dir, 'manifest.json'),
+			registry_dir=os.path.join(self.docs_dir, 'registry'), doxygen_dir=os.path.join(self.docs_dir, 'doxygen'),
+			header_file=os.path.join(repository_dir, 'header.html'), footer_file=os.path.join(repository_dir, 'footer.html'),
+			style_file=os.path.join(repository_dir, 'style.css'), script_file=os.path.join(repository_dir, 'script.js'),
+			hamburger_file=os.path.join(repository_dir, 'hamburger.svg'), critical_file=os.path.join(repository_dir, 'critical.css'))
+		return [step.repository for step in sorted(steps, key=lambda step : step.end) if step.name == 'doxygen']
+
+	def test_reruns(self):
+		# the first build doesn't run Doxygen again for the tag files that didn't exist yet
+		self.assertEqual(sorted(self.build(1)), ['repo0', 'repo1'])
+		self.assertTrue(os.path.isfile(os.path.join(self.docs_dir, 'html', 'repo0', 'include', 'file0.h.html')))
+		# 'repo0' read the tag file of 'repo1' before it changed, and links into it
+		self.set_tag('repo1', 'changed')
+		self.assertEqual(self.build(1), ['repo0', 'repo1', 'repo0'])
+		# 'repo1' read the tag file of 'repo0' before it changed, but doesn't link into it
+		self.set_tag('repo0', 'changed')
+		self.assertEqual(sorted(self.build(2)), ['repo0', 'repo1'])
+
+if __name__ == '__main__':
+	unittest.main()